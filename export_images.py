@@ -0,0 +1,77 @@
+'''
+Headless PNG export of the mazes of whole rooms, e.g. to print or archive boards.
+
+    python export_images.py 1 2 3 --out boards
+    python export_images.py --range 0 1000 --out boards --no-fog --scale 8
+'''
+import argparse
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game import Game
+from mazes import MyMaze
+
+
+def save_png(maze: MyMaze, path: str, fog: bool = True, scale: int = 1):
+    '''Writes the maze to a PNG file, each tile as a scale x scale square'''
+    import matplotlib.image as mpimg # no figure and no display: imsave only needs the image
+    img = maze.to_rgb(fog)
+    if scale > 1:
+        img = np.repeat(np.repeat(img, scale, axis=0), scale, axis=1)
+    mpimg.imsave(path, img)
+
+
+def export_room(room_id: int, out_dir: str, fog: bool = True, scale: int = 1) -> list[str]:
+    '''Writes every maze of the room to <out_dir>/<room_id>_<maze index>.png; returns the paths'''
+    with contextlib.redirect_stdout(io.StringIO()): # Game prints the solution
+        game = Game(room_id, is_second_player=False)
+    paths = []
+    for maze_idx, maze in enumerate(game.mazes):
+        path = os.path.join(out_dir, f'{room_id}_{maze_idx}.png')
+        save_png(maze, path, fog, scale)
+        paths.append(path)
+    return paths
+
+
+def _export_room_args(args: tuple) -> list[str]:
+    return export_room(*args)
+
+
+def export_rooms(room_ids: list[int], out_dir: str, fog: bool = True, scale: int = 1,
+                 max_workers: int | None = None) -> list[str]:
+    '''Exports many rooms across a process pool; returns the paths of all the images'''
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(room_id, out_dir, fog, scale) for room_id in room_ids]
+    if max_workers == 1:
+        results = map(_export_room_args, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            results = list(executor.map(_export_room_args, jobs, chunksize=max(1, len(jobs) // 64)))
+    return [path for paths in results for path in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the mazes of rooms as PNG images.')
+    parser.add_argument('room_ids', type=int, nargs='*', help='room ids to export')
+    parser.add_argument('--range', type=int, nargs=2, metavar=('START', 'STOP'), help='export the room ids in [START, STOP)')
+    parser.add_argument('--out', default='boards', help='output directory (default: boards)')
+    parser.add_argument('--no-fog', action='store_true', help='show the tiles under the fog')
+    parser.add_argument('--scale', type=int, default=1, help='size of a tile, in pixels (default: 1)')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default: one per CPU)')
+    args = parser.parse_args()
+
+    room_ids = list(args.room_ids)
+    if args.range:
+        room_ids += range(*args.range)
+    if not room_ids:
+        parser.error('no room ids given')
+    paths = export_rooms(room_ids, args.out, fog=not args.no_fog, scale=args.scale, max_workers=args.workers)
+    print(f'{len(paths)} images written to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
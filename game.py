@@ -1,91 +1,295 @@
-import random
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import os
 from string import ascii_lowercase
+import threading
+from typing import Callable, Iterator
 
 import numpy as np
 
 import mazes
+from routes import RouteEngine
 from utils.constants import *
-from utils.utils import get_english_words, split_word_into
+from utils.utils import get_english_words, load_npz_memmap, room_rng, split_word_into
+
+def _build_maze(args: tuple[int, str, int]) -> tuple[dict[str, np.ndarray], list[int], list[int], tuple[np.ndarray, np.ndarray]]:
+    '''Builds a maze in a worker process; only its layers, codes and item distances travel back'''
+    seed, letters, maze_idx = args
+    maze = mazes.MyMaze(seed=seed, letters=letters, maze_index=maze_idx)
+    return ({name: getattr(maze, name) for name in maze.LAYERS}, maze.checkpoint_codes_list, maze.info_keys,
+            (maze.item_distances, maze.item_sources))
+
+
+class LazyMazes:
+    '''The mazes of a lazy Game: every maze is generated the first time it is accessed
+    (or prefetched on a background thread before that), then kept'''
+    def __init__(self, n_mazes: int, build: Callable[[int], mazes.MyMaze]) -> None:
+        self._build = build
+        self._mazes: list[mazes.MyMaze | None] = [None] * n_mazes
+        self._locks = [threading.Lock() for _ in range(n_mazes)]
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='maze-prefetch')
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._mazes)
+
+    def __getitem__(self, maze_idx: int) -> mazes.MyMaze:
+        maze = self._mazes[maze_idx]
+        if maze is None:
+            with self._locks[maze_idx]: # it may be being built by the prefetcher right now
+                if self._mazes[maze_idx] is None:
+                    self._mazes[maze_idx] = self._build(maze_idx % len(self))
+                maze = self._mazes[maze_idx]
+        return maze
+
+    def __iter__(self) -> Iterator[mazes.MyMaze]:
+        return (self[maze_idx] for maze_idx in range(len(self)))
+
+    def is_built(self, maze_idx: int) -> bool:
+        return self._mazes[maze_idx] is not None
+
+    def prefetch(self, maze_indices: list[int]):
+        '''Builds the mazes on the background thread, in this order (not anymore once closed)'''
+        for maze_idx in maze_indices:
+            if not self._closed and not self.is_built(maze_idx):
+                self._prefetcher.submit(self.__getitem__, maze_idx)
+
+    def close(self):
+        '''Drops the pending prefetches and lets the background thread go; the mazes
+        can still be accessed (and built) afterwards'''
+        self._closed = True
+        self._prefetcher.shutdown(wait=False, cancel_futures=True)
+
+
+class CheckpointLookup(Mapping):
+    '''code: (maze index, i, j) of every checkpoint. The maze of a code is known
+    from the codes alone, so a lookup only needs (and builds) that maze'''
+    def __init__(self, mazes: list[mazes.MyMaze] | LazyMazes, checkpoint_codes_lists: list[list[int]]) -> None:
+        self.mazes = mazes
+        self.maze_of_code = {code: maze_idx for maze_idx, codes in enumerate(checkpoint_codes_lists) for code in codes}
+
+    def __getitem__(self, code: int) -> tuple[int, int, int]:
+        maze_idx = self.maze_of_code[code]
+        return (maze_idx, *self.mazes[maze_idx].find_checkpoint(code))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.maze_of_code)
+
+    def __len__(self) -> int:
+        return len(self.maze_of_code)
+
 
 class Game:
-    def __init__(self, room_id: int, is_second_player: bool) -> None:
+    def __init__(self, room_id: int, is_second_player: bool, parallel: bool | None = None, lazy: bool = False) -> None:
+        '''
+        parallel: build the mazes in worker processes; by default only when
+            there are at least PARALLEL_BUILD_MIN_TILES tiles (smaller ones are built
+            faster than the processes start) and more than one CPU. The mazes are the same either way
+        lazy: only build the maze of the starting position now; every other maze is built
+            when it is first accessed, or prefetched in the background (see LazyMazes)
+        '''
         self.seed = room_id
         self.is_second_player = is_second_player # 1st: False, 2nd: True
 
-        random.seed(self.seed)
-        self.deceptive_letters = ''.join((random.choice(ascii_lowercase) for _ in range(NUM_OF_MAZES*NUM_OF_INFO_HINTS)))
-        self.word_to_win = random.choice(get_english_words())
+        rng = room_rng(self.seed, RNG_WORDS)
+        self.deceptive_letters = ''.join(rng.choice(list(ascii_lowercase), size=NUM_OF_MAZES*NUM_OF_INFO_HINTS))
+        english_words = get_english_words()
+        self.word_to_win = english_words[rng.integers(len(english_words))]
         self.letters_with_deceptive = list(self.word_to_win + self.deceptive_letters)
-        random.shuffle(self.letters_with_deceptive)
+        rng.shuffle(self.letters_with_deceptive)
         word_to_win_new = ''.join(self.letters_with_deceptive)
 
         self.word_parts = split_word_into(word_to_win_new, n_parts=NUM_OF_MAZES)
-        self.mazes: list[mazes.MyMaze] = []
-        for maze_idx in range(NUM_OF_MAZES):
-            self.mazes.append(
-                mazes.MyMaze(seed=self.seed, letters=self.word_parts[maze_idx], maze_index=maze_idx)
-            )
+        self.grid_shape = (2*MAZE_SIZE[0]+1, 2*MAZE_SIZE[1]+1)
+        # visual clues, filled for every maze once it is built
+        self.color_marks_to_show = np.zeros((NUM_OF_MAZES, *self.grid_shape), dtype=int)
+        self.somethings_to_show = np.zeros((NUM_OF_MAZES, *self.grid_shape), dtype=int)
+
+        if lazy:
+            self.mazes = LazyMazes(NUM_OF_MAZES, self._build_maze_lazily)
+        else:
+            if parallel is None:
+                parallel = ((os.cpu_count() or 1) > 1
+                            and NUM_OF_MAZES * self.grid_shape[0] * self.grid_shape[1] >= PARALLEL_BUILD_MIN_TILES)
+            if parallel:
+                self.mazes = self._build_mazes_parallel()
+            else:
+                self.mazes: list[mazes.MyMaze] = []
+                for maze_idx in range(NUM_OF_MAZES):
+                    self.mazes.append(
+                        mazes.MyMaze(seed=self.seed, letters=self.word_parts[maze_idx], maze_index=maze_idx)
+                    )
+            for maze_idx in range(NUM_OF_MAZES):
+                self._generate_hints_to_show(maze_idx)
+
+        maze_codes = [mazes.MyMaze.room_codes(self.seed, maze_idx) for maze_idx in range(NUM_OF_MAZES)]
         self.info_key_map: dict[int, str] = {}
-        for maze_idx in range(NUM_OF_MAZES):
-            for ik_idx, info_key in enumerate(self.mazes[maze_idx].info_keys):
+        for maze_idx, (_, info_keys) in enumerate(maze_codes):
+            for ik_idx, info_key in enumerate(info_keys):
                 self.info_key_map[info_key] = f'{self.deceptive_letters[maze_idx*NUM_OF_INFO_HINTS + ik_idx].upper()} is deceptive!'
-        self.grid_shape = self.mazes[0].grid_shape
+        self.checkpoint_codes_backw = CheckpointLookup(self.mazes, [codes for codes, _ in maze_codes])
 
         self.revealed_exit: bool = False
+        self._routes: RouteEngine | None = None
 
-        
-        # visual clues
-        self._generate_color_marks_to_show()
-        self._generate_somethings_to_show()
-        self._generate_checkpoint_codes()
         self._generate_random_starting_position()
         self._generate_exit()
 
-        self.__print_info()
+        if not lazy:
+            self.__print_info()
+
+    def _build_maze_lazily(self, maze_idx: int) -> mazes.MyMaze:
+        maze = mazes.MyMaze(seed=self.seed, letters=self.word_parts[maze_idx], maze_index=maze_idx)
+        self._generate_hints_to_show(maze_idx, maze)
+        # the mazes its pits lead to are the ones the player can go to next
+        self.mazes.prefetch([pit.index for _, pit in maze.get_all_things(mazes.TileItemType.PIT)])
+        return maze
+
+    def _build_mazes_parallel(self) -> list[mazes.MyMaze]:
+        '''Every maze depends only on (seed, letters, maze index), so they are generated
+        side by side in worker processes and wrapped around the returned layers here'''
+        jobs = [(self.seed, self.word_parts[maze_idx], maze_idx) for maze_idx in range(NUM_OF_MAZES)]
+        with ProcessPoolExecutor(min(NUM_OF_MAZES, os.cpu_count() or 1)) as executor:
+            built = list(executor.map(_build_maze, jobs))
+        return [
+            mazes.MyMaze.from_layers(seed=self.seed, letters=self.word_parts[maze_idx], maze_index=maze_idx,
+                                     checkpoint_codes_list=codes, info_keys=info_keys, layers=layers,
+                                     item_distances=item_distances)
+            for maze_idx, (layers, codes, info_keys, item_distances) in enumerate(built)
+        ]
+
+    def close(self):
+        '''Stops building mazes in the background (see LazyMazes.close); call it once done with the game'''
+        if isinstance(self.mazes, LazyMazes):
+            self.mazes.close()
+
+    def save(self, path: str):
+        '''Writes the generated game to an uncompressed .npz: every layer of the mazes
+        stacked into one array, the hints shown to the first player, and the rest
+        as a JSON "meta" member (see load)'''
+        meta = {
+            'version': SAVE_FORMAT_VERSION,
+            'room_id': self.seed,
+            'word_to_win': self.word_to_win,
+            'deceptive_letters': self.deceptive_letters,
+            'letters_with_deceptive': self.letters_with_deceptive,
+            'word_parts': self.word_parts,
+            'info_key_map': list(self.info_key_map.items()),
+            'starting_position': self.starting_position,
+            'exit_position': self.exit_position,
+            'mazes': [{'checkpoint_codes_list': maze.checkpoint_codes_list, 'info_keys': maze.info_keys}
+                      for maze in self.mazes],
+        }
+        arrays = {name: np.stack([getattr(maze, name) for maze in self.mazes]) for name in mazes.MyMaze.LAYERS}
+        with open(path, 'wb') as f: # a file object, so that np.savez does not append .npz
+            np.savez(f, meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+                     color_marks_to_show=self.color_marks_to_show, somethings_to_show=self.somethings_to_show,
+                     **arrays)
+
+    @classmethod
+    def load(cls, path: str, is_second_player: bool, mmap_mode: str = 'c') -> 'Game':
+        '''A game written by save. The arrays are memory-mapped, not read:
+        'c' (copy-on-write) lets the game change them in memory only,
+        'r' is enough to look at the game but not to play it'''
+        arrays = load_npz_memmap(path, mmap_mode)
+        meta = json.loads(arrays.pop('meta').tobytes())
+        if meta['version'] != SAVE_FORMAT_VERSION:
+            raise ValueError(f'{path}: save format version {meta["version"]}, expected {SAVE_FORMAT_VERSION}')
+
+        game = cls.__new__(cls)
+        game.seed = meta['room_id']
+        game.is_second_player = is_second_player
+        game.word_to_win = meta['word_to_win']
+        game.deceptive_letters = meta['deceptive_letters']
+        game.letters_with_deceptive = meta['letters_with_deceptive']
+        game.word_parts = meta['word_parts']
+        game.mazes = [
+            mazes.MyMaze.from_layers(seed=game.seed, letters=game.word_parts[maze_idx], maze_index=maze_idx,
+                                     layers={name: arrays[name][maze_idx] for name in mazes.MyMaze.LAYERS},
+                                     **maze_meta)
+            for maze_idx, maze_meta in enumerate(meta['mazes'])
+        ]
+        game.info_key_map = {int(key): hint for key, hint in meta['info_key_map']}
+        game.checkpoint_codes_backw = CheckpointLookup(game.mazes, [maze.checkpoint_codes_list for maze in game.mazes])
+        game.grid_shape = game.mazes[0].grid_shape
+        game.revealed_exit = False
+        game._routes = None
+        game.color_marks_to_show = arrays['color_marks_to_show']
+        game.somethings_to_show = arrays['somethings_to_show']
+        game.starting_position = tuple(meta['starting_position'])
+        game.exit_maze_index = meta['exit_position'][0]
+        game._exit_position = tuple(meta['exit_position'])
+        return game
+
+    def same_layout(self, other: 'Game') -> bool:
+        '''Same generated game (whoever plays it, and however far they got), e.g. after a save/load round-trip'''
+        return (self.seed == other.seed and self.word_to_win == other.word_to_win
+                and self.deceptive_letters == other.deceptive_letters
+                and self.letters_with_deceptive == other.letters_with_deceptive
+                and self.word_parts == other.word_parts
+                and self.info_key_map == other.info_key_map
+                and self.checkpoint_codes == other.checkpoint_codes
+                and self.starting_position == other.starting_position
+                and self.exit_position == other.exit_position
+                and np.array_equal(self.color_marks_to_show, other.color_marks_to_show)
+                and np.array_equal(self.somethings_to_show, other.somethings_to_show)
+                and len(self.mazes) == len(other.mazes)
+                and all(a.same_layout(b) for a, b in zip(self.mazes, other.mazes)))
+
+    @property
+    def routes(self) -> RouteEngine:
+        '''Shortest routes across all the mazes; built on first use and cached for the game'''
+        if self._routes is None:
+            self._routes = RouteEngine(self)
+        return self._routes
+
+    @property
+    def checkpoint_codes(self) -> dict[tuple[int, int, int], int]:
+        '''(maze index, i, j): code of every checkpoint (needs every maze)'''
+        return {position: code for code, position in self.checkpoint_codes_backw.items()}
+
+    @property
+    def exit_position(self) -> tuple[int, int, int]:
+        '''(maze index, i, j) of the exit; only exit_maze_index is known before the maze is built'''
+        if self._exit_position is None:
+            all_empty_passes = self.mazes[self.exit_maze_index].get_all_empty_passes()
+            chosen_tile_pos = all_empty_passes[self._exit_rng.integers(len(all_empty_passes))]
+            self._exit_position = (self.exit_maze_index, *chosen_tile_pos)
+        return self._exit_position
 
     def __print_info(self):
         print(f'{self.word_to_win=}\n{self.deceptive_letters=}\n{self.starting_position=}\n{self.word_parts=}\n{self.info_key_map=}\n{self.checkpoint_codes=}\n{self.seed=}')
 
-    def _generate_color_marks_to_show(self):
-        self.color_marks_to_show = np.zeros((NUM_OF_MAZES, *self.grid_shape), dtype=int)
-        random.seed(self.seed)
-        for maze_id, maze in enumerate(self.mazes):
-            marks = maze.get_all_color_marks()
-            random.shuffle(marks)
-            marks_to_show = marks[:PER_MAP_COLOR_MARKS_SHOWN]
-            deceptive_mark_id = random.randrange(PER_MAP_COLOR_MARKS_SHOWN) # this one lies
-            for idx, ((i, j), tc) in enumerate(marks_to_show):
-                if idx != deceptive_mark_id:
-                    self.color_marks_to_show[maze_id, i, j] = tc.value
-                else:
-                    self.color_marks_to_show[maze_id, i, j] = tc.value+1 if tc.value != 3 else 1
-    
-    def _generate_somethings_to_show(self):
-        self.somethings_to_show = np.zeros((NUM_OF_MAZES, *self.grid_shape), dtype=int)
-        random.seed(self.seed)
-        for maze_id, maze in enumerate(self.mazes):
-            hints = maze.get_all_things()
-            random.shuffle(hints)
-            hints_to_show = hints[:SOMETHING_HINTS_SHOWN]
-            for ((i, j), _) in hints_to_show:
-                self.somethings_to_show[maze_id, i, j] = 1
-
-    def _generate_checkpoint_codes(self):
-        self.checkpoint_codes: dict[tuple[int, int, int], int] = {}
-        for maze_id, maze in enumerate(self.mazes):
-            self.checkpoint_codes.update(maze.checkpoint_codes)
-        self.checkpoint_codes_backw = dict(zip(self.checkpoint_codes.values(), self.checkpoint_codes.keys()))
+    def _generate_hints_to_show(self, maze_id: int, maze: mazes.MyMaze | None = None):
+        '''Fills the color marks and the somethings shown to the first player in a maze'''
+        maze = self.mazes[maze_id] if maze is None else maze
+        rng = room_rng(self.seed, RNG_MARKS, maze_id)
+        marks = maze.get_all_color_marks()
+        rng.shuffle(marks)
+        marks_to_show = marks[:PER_MAP_COLOR_MARKS_SHOWN]
+        deceptive_mark_id = rng.integers(PER_MAP_COLOR_MARKS_SHOWN) # this one lies
+        for idx, ((i, j), tc) in enumerate(marks_to_show):
+            if idx != deceptive_mark_id:
+                self.color_marks_to_show[maze_id, i, j] = tc.value
+            else:
+                self.color_marks_to_show[maze_id, i, j] = tc.value+1 if tc.value != 3 else 1
+
+        rng = room_rng(self.seed, RNG_HINTS, maze_id)
+        hints = maze.get_all_things()
+        rng.shuffle(hints)
+        hints_to_show = hints[:SOMETHING_HINTS_SHOWN]
+        for ((i, j), _) in hints_to_show:
+            self.somethings_to_show[maze_id, i, j] = 1
 
     def _generate_random_starting_position(self):
-        random.seed(self.seed + 10)
-        maze_index = np.random.randint(NUM_OF_MAZES)
+        rng = room_rng(self.seed, RNG_START)
+        maze_index = int(rng.integers(NUM_OF_MAZES))
         all_empty_passes = self.mazes[maze_index].get_all_empty_passes()
-        chosen_tile_pos = random.choice(all_empty_passes)
+        chosen_tile_pos = all_empty_passes[rng.integers(len(all_empty_passes))]
         self.starting_position = (maze_index, *chosen_tile_pos)
 
     def _generate_exit(self):
-        random.seed(self.seed + 11)
-        maze_index = np.random.randint(NUM_OF_MAZES)
-        all_empty_passes = self.mazes[maze_index].get_all_empty_passes()
-        chosen_tile_pos = random.choice(all_empty_passes)
-        self.exit_position = (maze_index, *chosen_tile_pos)
+        self._exit_rng = room_rng(self.seed, RNG_EXIT)
+        self.exit_maze_index = int(self._exit_rng.integers(NUM_OF_MAZES))
+        self._exit_position: tuple[int, int, int] | None = None # see exit_position
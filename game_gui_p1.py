@@ -4,6 +4,9 @@ import random
 
 from game import Game
 from mazes import TC, TT, TileItemType
+from gui.camera import Camera
+from gui.compositor import get_compositor
+from gui.frame_scheduler import FrameScheduler
 from gui.gui_rect import Button, Label, Panel, TextEntry
 from gui.gui_utils import *
 from utils.constants import NUM_OF_MAZES, PER_MAP_COLOR_MARKS_SHOWN, SOMETHING_HINTS_SHOWN
@@ -17,14 +20,19 @@ TILE_ITEM_TYPES_COLORS = [
 ]
 
 FOG_GRAY = [120, 120, 120]
+TILE_COLORS = np.array([[10, 10, 10], [255, 255, 255], FOG_GRAY], dtype=np.uint8) # wall, pass, fog
 EXIT_COLOR = [10, 245, 0]
+LAYER_COLORKEY = (255, 0, 255) # the see-through gaps around the tiles of the maze layers
 ORANGE = [240, 160, 25]
 
 TILE_SIZE = 45
 SKIP_SIZE = 2
 BIG_SKIP_SIZE = 5
 CHOOSE_MAZE_BTN_SIZE = 50
+CONTROL_PANELS_WIDTH = 6*CHOOSE_MAZE_BTN_SIZE + 7*BIG_SKIP_SIZE
 EXIT_BTN_SIZE = (60, 60)
+ZOOM_LEVELS = (2, 3, 4, 6, 8, 12, 16, 24, 32, TILE_SIZE + SKIP_SIZE, 64, 96) # tile pitches, in pixels
+MINIMAP_MAX_PITCH = 12 # up to here, the mazes are shown as minimaps: no gaps and no notes
 
 class GameGUI1:
     '''GUI for the first player (P1)'''
@@ -34,7 +42,8 @@ class GameGUI1:
         self.grid_shape = self.game.grid_shape
         pygame.init()
         self.surface = surface
-        self.clock = pygame.time.Clock()
+        self.frame_scheduler = FrameScheduler()
+        self.compositor = get_compositor(self.surface)
         self.is_running = True
         self.feedback = ''; self.feedback_color = WHITE
 
@@ -44,9 +53,17 @@ class GameGUI1:
         self.mazes_boolean_map = np.zeros((NUM_OF_MAZES, *self.grid_shape), dtype=int)
         self.revealed_checkpoints: dict[tuple[int, int, int], int] = {}
 
+        # retained rendering of the mazes in view, see draw_maze; the layers are redrawn when the camera state changes
+        self._maze_colors: dict[int, np.ndarray] = {}
+        self._minimaps: dict[int, pygame.Surface] = {}
+        self._static_layers: dict[int, tuple[tuple, pygame.Surface]] = {}
+        self._maze_layers: dict[int, tuple[tuple, pygame.Surface, np.ndarray | None]] = {}
+        self.panning = False # dragging the mazes with the middle mouse button
+
         # creating the panels:
         self.exit_btn = Button((WINDOW_SIZE[0]-20-EXIT_BTN_SIZE[0], 20), EXIT_BTN_SIZE, self.surface, 'EXIT', 'exit the game')
         self._create_mazes_panel()
+        self.camera = Camera(self.mazes_panel.rect, self.grid_shape, TILE_SIZE + SKIP_SIZE, SKIP_SIZE, ZOOM_LEVELS)
         self._create_maze_control_panel()
         self._create_command_line_panel()
 
@@ -56,17 +73,19 @@ class GameGUI1:
         ]
 
     def _create_mazes_panel(self):
+        # the whole maze at the default zoom level if it fits next to the other panels, the camera shows a part of it otherwise
         self.mazes_panel = Panel(
             (20, 20), 
-            (self.grid_shape[1]*(TILE_SIZE + SKIP_SIZE) + SKIP_SIZE, 
-                    self.grid_shape[0]*(TILE_SIZE + SKIP_SIZE) + SKIP_SIZE),
+            (min(self.grid_shape[1]*(TILE_SIZE + SKIP_SIZE) + SKIP_SIZE,
+                    WINDOW_SIZE[0] - 20 - 2*SKIP_SIZE - CONTROL_PANELS_WIDTH - EXIT_BTN_SIZE[0] - 40),
+                min(self.grid_shape[0]*(TILE_SIZE + SKIP_SIZE) + SKIP_SIZE, WINDOW_SIZE[1] - 40)),
             self.surface
         )
     
     def _create_maze_control_panel(self):
         self.maze_control_panel = Panel(
             (self.mazes_panel.rect.topright[0] + 2 * SKIP_SIZE, 20),
-            (6*CHOOSE_MAZE_BTN_SIZE + 7 * BIG_SKIP_SIZE, 2*BIG_SKIP_SIZE+CHOOSE_MAZE_BTN_SIZE),
+            (CONTROL_PANELS_WIDTH, 2*BIG_SKIP_SIZE+CHOOSE_MAZE_BTN_SIZE),
             self.surface, 'choose the maze'
         )
         for i in range(len(self.game.mazes)):
@@ -106,85 +125,143 @@ class GameGUI1:
             Label('*'*40, self.surface, FONT_SMALL, WHITE, topleft=(BIG_SKIP_SIZE, 2*BIG_SKIP_SIZE+CHOOSE_MAZE_BTN_SIZE))
         ])
 
-    def draw_maze(self, maze_index: int):
-        for i in range(self.grid_shape[0]):
-            for j in range(self.grid_shape[1]):
-                this_tile = self.game.mazes[maze_index].maze[i][j]
-                if this_tile.visible:
-                    if this_tile._type == TT.PASS:
-                        fill_color = (255, 255, 255)
-                    else:
-                        fill_color = (10, 10, 10)
-                else:
-                    fill_color = FOG_GRAY
-                # tile itself:
-                pygame.draw.rect(self.surface, fill_color, 
-                    pygame.rect.Rect(20 + SKIP_SIZE + (SKIP_SIZE + TILE_SIZE)*j, 
-                                    SKIP_SIZE + 20 + (SKIP_SIZE + TILE_SIZE)*i, TILE_SIZE, TILE_SIZE),
-                    border_radius=2
-                )
-                # exit tile
-                if self.game.revealed_exit and maze_index == self.game.exit_position[0]:
-                    pygame.draw.rect(self.surface, EXIT_COLOR,
-                        pygame.rect.Rect(22 + SKIP_SIZE + (SKIP_SIZE + TILE_SIZE)*self.game.exit_position[2], 
-                                        SKIP_SIZE + 22 + (SKIP_SIZE + TILE_SIZE)*self.game.exit_position[1], TILE_SIZE-4, TILE_SIZE-4),
-                        border_radius=1
-                    )   
-                # border rect:
-                if self.mazes_boolean_map[self.chosen_maze_idx, i, j]:
-                    self.game.somethings_to_show[self.chosen_maze_idx, i, j] = 0 # removes the hint
-                    pygame.draw.rect(self.surface, (150, 150, 150),
-                        pygame.rect.Rect(21 + SKIP_SIZE + (SKIP_SIZE + TILE_SIZE)*j, 
-                                        SKIP_SIZE + 21 + (SKIP_SIZE + TILE_SIZE)*i, TILE_SIZE-2, TILE_SIZE-2),
+    def _tile_rect(self, i: int, j: int, inset: int = 0) -> pygame.Rect:
+        '''Rect of a tile on the maze layers (whose topleft is the one of the mazes panel), shrunk by
+        inset (in pixels at the default zoom level)'''
+        return self.camera.tile_rect(i, j, self.camera.scaled(inset))
+
+    def _tile_colors(self, maze_index: int) -> np.ndarray:
+        '''(h, w, 3) colors of the tiles as P1 sees them: walls, passes and fog'''
+        if maze_index not in self._maze_colors:
+            maze = self.game.mazes[maze_index]
+            lut_rows = (maze.tile_types == TT.PASS.value).astype(np.uint8)
+            lut_rows[~maze.visible] = 2
+            self._maze_colors[maze_index] = TILE_COLORS[lut_rows]
+        return self._maze_colors[maze_index]
+
+    def _minimap(self, maze_index: int) -> pygame.Surface:
+        '''The maze with a pixel per tile, for the far zoom levels'''
+        if maze_index not in self._minimaps:
+            self._minimaps[maze_index] = pygame.surfarray.make_surface(self._tile_colors(maze_index).swapaxes(0, 1)).convert()
+        return self._minimaps[maze_index]
+
+    def _draw_static_tiles(self, layer: pygame.Surface, maze_index: int, area: pygame.Rect):
+        '''Draws the tiles of the static layer inside area (and nothing outside of it)'''
+        layer.set_clip(area)
+        layer.fill(LAYER_COLORKEY)
+        rows, cols = self.camera.tiles_in(area)
+        colors = self._tile_colors(maze_index)[rows.start:rows.stop, cols.start:cols.stop].tolist()
+        radius = self.camera.scaled(2)
+        for i, row_colors in zip(rows, colors):
+            for j, fill_color in zip(cols, row_colors):
+                pygame.draw.rect(layer, fill_color, self._tile_rect(i, j), border_radius=radius)
+        layer.set_clip(None)
 
-                        width=3,
-                        border_radius=3
-                    )
-                if (marker_ind:=self.mazes_markers_map[self.chosen_maze_idx, i, j]) > 0:
-                    pygame.draw.rect(self.surface, TILE_ITEM_TYPES_COLORS[marker_ind],
-                        pygame.rect.Rect(30 + SKIP_SIZE + (SKIP_SIZE + TILE_SIZE)*j, 
-                                        SKIP_SIZE + 30 + (SKIP_SIZE + TILE_SIZE)*i, TILE_SIZE-20, TILE_SIZE-20),
-                        border_radius=3
-                    )
-                if fill_color != FOG_GRAY and (col_ind:=self.game.color_marks_to_show[self.chosen_maze_idx, i, j]) > 0:
-                    pygame.draw.rect(self.surface, COLORS_INTS[col_ind],
-                        pygame.rect.Rect(24 + SKIP_SIZE + (SKIP_SIZE + TILE_SIZE)*j, 
-                                        SKIP_SIZE + 24 + (SKIP_SIZE + TILE_SIZE)*i, TILE_SIZE-8, TILE_SIZE-8),
-                        width=5
-                    )
-                if (col_ind:=self.mazes_color_map[self.chosen_maze_idx, i, j]) > 0:
-                    pygame.draw.rect(self.surface, COLORS_INTS[col_ind],
-                        pygame.rect.Rect(26 + SKIP_SIZE + (SKIP_SIZE + TILE_SIZE)*j, 
-                                        SKIP_SIZE + 26 + (SKIP_SIZE + TILE_SIZE)*i, TILE_SIZE-12, TILE_SIZE-12),
-                        width=4,
-                        border_radius=3
-                    )
-                if fill_color != FOG_GRAY and self.game.somethings_to_show[self.chosen_maze_idx, i, j]:
-                    pygame.draw.rect(self.surface, [0, 0, 0],
-                        pygame.rect.Rect(30 + SKIP_SIZE + (SKIP_SIZE + TILE_SIZE)*j, 
-                                        SKIP_SIZE + 30 + (SKIP_SIZE + TILE_SIZE)*i, TILE_SIZE-20, TILE_SIZE-20),
-                        width=4,
-                        border_radius=3
-                    )
+    def _static_layer(self, maze_index: int) -> pygame.Surface:
+        '''Walls, passes and fog of the tiles in view: they never change, so they are only drawn
+        again when the camera moves (and when it pans, only the tiles coming into view).
+        At far zoom levels, the part of the minimap in view, scaled up'''
+        state, layer = self._static_layers.get(maze_index, (None, None))
+        if state != self.camera.state:
+            if layer is None:
+                layer = pygame.Surface(self.mazes_panel.rect.size).convert()
+            pitch, (ox, oy) = self.camera.state
+            if pitch <= MINIMAP_MAX_PITCH:
+                layer.fill(LAYER_COLORKEY)
+                rows, cols = self.camera.visible_tiles()
+                window = self._minimap(maze_index).subsurface(cols.start, rows.start, len(cols), len(rows))
+                layer.blit(pygame.transform.scale(window, (len(cols) * pitch, len(rows) * pitch)),
+                           (pitch * cols.start - ox, pitch * rows.start - oy))
+            elif state is not None and state[0] == pitch: # panned: scroll what is still in view
+                dx, dy = state[1][0] - ox, state[1][1] - oy
+                layer.scroll(dx, dy)
+                w, h = layer.get_size()
+                for area in (pygame.Rect(0 if dx > 0 else w + dx, 0, abs(dx), h), pygame.Rect(0, 0 if dy > 0 else h + dy, w, abs(dy))):
+                    if area.clip(layer.get_rect()):
+                        self._draw_static_tiles(layer, maze_index, area.clip(layer.get_rect()))
+            else:
+                self._draw_static_tiles(layer, maze_index, layer.get_rect())
+            self._static_layers[maze_index] = self.camera.state, layer
+        return layer
+
+    def _annotations(self, maze_index: int, rows: range, cols: range) -> np.ndarray:
+        '''What is drawn over the tiles in rows x cols: bool, marker, color mark shown, color, something shown'''
+        window = np.s_[maze_index, rows.start:rows.stop, cols.start:cols.stop]
+        visible = self.game.mazes[maze_index].visible[window[1:]]
+        return np.stack([
+            self.mazes_boolean_map[window],
+            self.mazes_markers_map[window],
+            self.game.color_marks_to_show[window] * visible, # nothing is shown under the fog
+            self.mazes_color_map[window],
+            self.game.somethings_to_show[window] * visible,
+        ])
+
+    def _draw_annotations(self, layer: pygame.Surface, i: int, j: int, annotations: np.ndarray):
+        boolean, marker_ind, color_mark_ind, color_ind, something = annotations.tolist()
+        scaled = self.camera.scaled
+        if boolean: # border rect
+            pygame.draw.rect(layer, (150, 150, 150), self._tile_rect(i, j, 1), width=scaled(3, 1), border_radius=scaled(3))
+        if marker_ind > 0:
+            pygame.draw.rect(layer, TILE_ITEM_TYPES_COLORS[marker_ind], self._tile_rect(i, j, 10), border_radius=scaled(3))
+        if color_mark_ind > 0:
+            pygame.draw.rect(layer, COLORS_INTS[color_mark_ind], self._tile_rect(i, j, 4), width=scaled(5, 1))
+        if color_ind > 0:
+            pygame.draw.rect(layer, COLORS_INTS[color_ind], self._tile_rect(i, j, 6), width=scaled(4, 1), border_radius=scaled(3))
+        if something:
+            pygame.draw.rect(layer, [0, 0, 0], self._tile_rect(i, j, 10), width=scaled(4, 1), border_radius=scaled(3))
+
+    def _maze_layer(self, maze_index: int) -> pygame.Surface:
+        '''The static layer with P1's notes and hints drawn over it (except at the minimap zoom levels);
+        only the tiles whose annotations changed since the last frame are redrawn'''
+        static_layer = self._static_layer(maze_index)
+        state, layer, drawn = self._maze_layers.get(maze_index, (None, None, None))
+        if state != self.camera.state:
+            if layer is None:
+                layer = static_layer.copy()
+                layer.set_colorkey(LAYER_COLORKEY)
+            else:
+                layer.blit(static_layer, (0, 0))
+            drawn = None
+        if self.camera.pitch <= MINIMAP_MAX_PITCH:
+            self._maze_layers[maze_index] = self.camera.state, layer, None
+            return layer
+        rows, cols = self.camera.visible_tiles()
+        annotations = self._annotations(maze_index, rows, cols)
+        changed = annotations.any(axis=0) if drawn is None else (annotations != drawn).any(axis=0)
+        for wi, wj in zip(*np.nonzero(changed)):
+            i, j = rows.start + wi, cols.start + wj
+            tile_rect = self._tile_rect(i, j)
+            layer.blit(static_layer, tile_rect, tile_rect)
+            self._draw_annotations(layer, i, j, annotations[:, wi, wj])
+            if drawn is not None: # a fresh layer is sent to the window whole anyway
+                self.compositor.invalidate(tile_rect.move(self.mazes_panel.rect.topleft).clip(self.mazes_panel.rect))
+        self._maze_layers[maze_index] = self.camera.state, layer, annotations
+        return layer
+
+    def draw_maze(self, maze_index: int):
+        '''A single blit of the maze layer, plus the exit and the checkpoints on top of it'''
+        topleft = self.mazes_panel.rect.topleft
+        clip = self.surface.get_clip()
+        self.surface.set_clip(self.mazes_panel.rect.inflate(-2*SKIP_SIZE, -2*SKIP_SIZE)) # the frame of the panel stays visible
+        self.compositor.mark((self, 'maze'), self.surface.blit(self._maze_layer(maze_index), topleft), (maze_index, self.camera.state))
+        # exit tile
+        if self.game.revealed_exit and maze_index == self.game.exit_maze_index:
+            self.compositor.mark((self, 'exit'), pygame.draw.rect(self.surface, EXIT_COLOR,
+                self._tile_rect(*self.game.exit_position[1:], 2).move(topleft), border_radius=self.camera.scaled(1)))
         for coords in self.revealed_checkpoints.keys():
-            if coords[0] != self.chosen_maze_idx: continue
+            if coords[0] != maze_index: continue
             _, i, j = coords
-            pygame.draw.rect(self.surface, [0, 0, 255], 
-                    pygame.rect.Rect(20 + SKIP_SIZE + (SKIP_SIZE + TILE_SIZE)*j, 
-                                    SKIP_SIZE + 20 + (SKIP_SIZE + TILE_SIZE)*i, TILE_SIZE, TILE_SIZE),
-                    border_radius=2
-                )
+            self.compositor.mark((self, coords), pygame.draw.rect(self.surface, [0, 0, 255],
+                self._tile_rect(i, j).move(topleft), border_radius=self.camera.scaled(2)))
+        self.surface.set_clip(clip)
 
     def set_feedback(self, msg, color=WHITE):
         self.feedback = msg
         self.feedback_color = color
 
-    def maze_tile_hovering(self, pos):
-        '''Returns the coordinates of the Tile hovering'''
-        x = pos[0] - 20; y = pos[1] - 20
-        j = x // (TILE_SIZE + SKIP_SIZE)
-        i = y // (TILE_SIZE + SKIP_SIZE)
-        return i, j
+    def maze_tile_hovering(self, pos) -> tuple[int, int] | None:
+        '''Returns the coordinates of the Tile hovering (None if there is no tile there)'''
+        return self.camera.tile_at(pos)
 
     def update_gui(self, pos):
         self.exit_btn.update(pos)
@@ -255,18 +332,20 @@ class GameGUI1:
 
     def run(self):
         while self.is_running:
-            self.clock.tick(FRAMERATE)
-            self.surface.fill(BLACK)
+            events = self.frame_scheduler.next_frame()
+            self.compositor.begin_frame()
             pos = pygame.mouse.get_pos()
 
             # update gui
             self.update_gui(pos)
 
             # process events
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         for te in self.text_entries: te.focused = False
+                    elif event.key == pygame.K_F3:
+                        self.compositor.toggle_debug()
                     if any(te.focused for te in self.text_entries):
                         for te in self.text_entries:
                             if te.focused:
@@ -279,8 +358,7 @@ class GameGUI1:
                                     self.process_cmd_prompt()
                         continue
                     elif event.key == pygame.K_SPACE:
-                        if self.mazes_panel.clicked():
-                            coord = self.maze_tile_hovering(pos)
+                        if self.mazes_panel.clicked() and (coord := self.maze_tile_hovering(pos)) is not None:
                             self.mazes_markers_map[self.chosen_maze_idx, coord[0], coord[1]] = \
                                 (self.mazes_markers_map[self.chosen_maze_idx, coord[0], coord[1]] + 1) % len(TILE_ITEM_TYPES_COLORS)
                             play_sfx('switch')
@@ -292,8 +370,21 @@ class GameGUI1:
                     elif event.key == pygame.K_LEFT:
                         self.chosen_maze_idx = (self.chosen_maze_idx - 1) % NUM_OF_MAZES
                         play_sfx('switch')
+                    elif event.key in {pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS}:
+                        self.camera.zoom(1)
+                    elif event.key in {pygame.K_MINUS, pygame.K_KP_MINUS}:
+                        self.camera.zoom(-1)
+                    elif event.key == pygame.K_HOME:
+                        self.camera.reset()
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 2 and self.mazes_panel.clicked():
+                        self.panning = True
+                elif event.type == pygame.MOUSEMOTION and self.panning:
+                    self.camera.pan(*event.rel)
                 elif event.type == pygame.MOUSEBUTTONUP:
-                    if self.maze_control_panel.clicked():
+                    if event.button == 2 and self.panning:
+                        self.panning = False
+                    elif self.maze_control_panel.clicked():
                         obj_clicked = self.maze_control_panel.object_clicked()
                         if not obj_clicked: continue
                         if int(obj_clicked) in range(len(self.game.mazes)):
@@ -307,18 +398,23 @@ class GameGUI1:
                             self.process_cmd_prompt()
                         play_sfx('click')
                     elif self.mazes_panel.clicked():
+                        if event.button in {4, 5} and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                            self.camera.zoom(1 if event.button == 4 else -1, anchor=pos)
+                            continue
                         coord = self.maze_tile_hovering(pos)
+                        if coord is None: continue
                         if event.button in {4, 5}:
                             delt = 1 if event.button == 4 else -1
                             self.mazes_color_map[self.chosen_maze_idx, coord[0], coord[1]] = \
                                 (self.mazes_color_map[self.chosen_maze_idx, coord[0], coord[1]] + delt) % 4
                             play_sfx('short_click')
                         elif event.button == 1:
-                            print('deb', coord, self.game.mazes[self.chosen_maze_idx].maze[coord[0]][coord[1]])
+                            print('deb', coord, self.game.mazes[self.chosen_maze_idx].tile(*coord))
                         elif event.button == 3:
-                            coord = self.maze_tile_hovering(pos)
                             self.mazes_boolean_map[self.chosen_maze_idx, coord[0], coord[1]] = \
                                 1 - self.mazes_boolean_map[self.chosen_maze_idx, coord[0], coord[1]]
+                            if self.mazes_boolean_map[self.chosen_maze_idx, coord[0], coord[1]]:
+                                self.game.somethings_to_show[self.chosen_maze_idx, coord[0], coord[1]] = 0 # removes the hint
                             play_sfx('short_click')
                     elif self.exit_btn.clicked():
                         play_sfx('click')
@@ -330,4 +426,4 @@ class GameGUI1:
                     code = self.revealed_checkpoints.get((self.chosen_maze_idx, *coord_hovering))
                     if code is not None:
                         self.set_feedback(f'{code} checkpoint', color=COLORS_INTS[3])
-            pygame.display.update()
+            self.compositor.end_frame()
@@ -3,6 +3,8 @@ import numpy as np
 import pygame
 
 from game import Game
+from gui.compositor import get_compositor, mark
+from gui.frame_scheduler import FrameScheduler
 from gui.gui_rect import Draggable, Panel, Button, Label
 from gui.gui_utils import *
 from mazes import TC, Tile, TT, TileItemType
@@ -19,7 +21,9 @@ EXIT_BTN_SIZE = (60, 60)
 class ButtonThickBorders(Button):
     def draw(self) -> None:
         if self.visible:
-            pygame.draw.rect(self.surface, self.color_frame, self.rect, width=16 if self.hovering else 8, border_radius=3)
+            width = 16 if self.hovering else 8
+            mark(self.surface, self, pygame.draw.rect(self.surface, self.color_frame, self.rect, width=width, border_radius=3),
+                 (self.color_frame, width))
 
 
 class GameGUI2:
@@ -28,7 +32,8 @@ class GameGUI2:
         self.game = game
         pygame.init()
         self.surface = surface
-        self.clock = pygame.time.Clock()
+        self.frame_scheduler = FrameScheduler()
+        self.compositor = get_compositor(self.surface)
         self.is_running = True
 
         self.position: tuple[int, int, int] = self.game.starting_position
@@ -147,7 +152,7 @@ class GameGUI2:
             act_button_text = ''
             info_label = ''
             self.current_tile_panel.gui_objects['act_btn'].hint_label.set_text('do something')
-            if self.act_btn_clicked_on_exit >= 5 and self.position == self.game.exit_position:
+            if self.act_btn_clicked_on_exit >= 5 and self.is_on_exit():
                 main_label = 'VICTORY!'
                 info_label = 'well done :)'
                 color = GREEN
@@ -196,18 +201,19 @@ class GameGUI2:
     def _update_closest_something_cache(self):
         if self.closest_something_cache is None:
             maze_id, i, j = self.position
-            path = self.game.mazes[maze_id].bfs((i, j))
-            self.closest_something_cache = len(path) - 1 if path else -1
+            self.closest_something_cache = self.game.mazes[maze_id].closest_item_distance(i, j)
     
     def update(self):
         self._update_closest_something_cache()
+        if any(letter.holding for letter in self.left_panel.gui_objects.values()):
+            self.frame_scheduler.wake()
         if not self.victory_sound_played and self.act_btn_clicked_on_exit >= 5:
             play_sfx('victory')
             self.victory_sound_played = True
 
     def collected_new_letter(self, letter: str):
         maze_id, i, j = self.position
-        self.game.mazes[maze_id].maze[i][j].has = None
+        self.game.mazes[maze_id].set_item(i, j, None)
         self.left_panel.populate_one(
             str(len(self.letters_collected)),
             Draggable((60, 60), DRAGGABLE_LETTER_SIZE, self.surface, letter.upper(), text_font=FONT_BIG, parent=self.left_panel)
@@ -216,10 +222,14 @@ class GameGUI2:
         self.closest_something_cache = None
         print('collected letter', letter)
 
+    def is_on_exit(self) -> bool:
+        # the maze index first: the exit itself is only known once its maze is built
+        return self.position[0] == self.game.exit_maze_index and self.position == self.game.exit_position
+
     def process_act_btn_press(self):
         print('act btn pressed', 'current pos: ', self.position)
         this_tile = self.tile_and_neigh_cache[0]
-        if self.position == self.game.exit_position:
+        if self.is_on_exit():
             print('this is the exit!')
             self.act_btn_clicked_on_exit += 1
             return
@@ -228,11 +238,8 @@ class GameGUI2:
             play_sfx_warning()
             return
         if this_tile.has.tile_item_type == TileItemType.PIT:
-            things = self.game.mazes[this_tile.has.index].get_all_things()
-            for thing in things:
-                if thing[1].tile_item_type == TileItemType.PIT and thing[1].index == self.position[0]:
-                    break
-            self.set_position((this_tile.has.index, *thing[0]))
+            other_pit = self.game.mazes[this_tile.has.index].find_pit(leading_to=self.position[0])
+            self.set_position((this_tile.has.index, *other_pit))
             print('fell to', self.position)
             play_sfx('teleport')
         elif this_tile.has.tile_item_type == TileItemType.CHECKPOINT:
@@ -255,11 +262,11 @@ class GameGUI2:
         
     def get_this_tile_and_neigh(self) -> tuple[Tile, Tile, Tile, Tile, Tile]:
         maze_id, i, j = self.position
-        this_tile = self.game.mazes[maze_id].maze[i][j]
-        up_tile = self.game.mazes[maze_id].maze[i-1][j]
-        down_tile = self.game.mazes[maze_id].maze[i+1][j]
-        left_tile = self.game.mazes[maze_id].maze[i][j-1]
-        right_tile = self.game.mazes[maze_id].maze[i][j+1]
+        this_tile = self.game.mazes[maze_id].tile(i, j)
+        up_tile = self.game.mazes[maze_id].tile(i-1, j)
+        down_tile = self.game.mazes[maze_id].tile(i+1, j)
+        left_tile = self.game.mazes[maze_id].tile(i, j-1)
+        right_tile = self.game.mazes[maze_id].tile(i, j+1)
         return this_tile, up_tile, down_tile, right_tile, left_tile
     
     def set_position(self, set_to: tuple[int, int, int]):
@@ -288,8 +295,8 @@ class GameGUI2:
 
     def run(self):
         while self.is_running:
-            self.clock.tick(FRAMERATE)
-            self.surface.fill(BLACK)
+            events = self.frame_scheduler.next_frame()
+            self.compositor.begin_frame()
             pos = pygame.mouse.get_pos()
 
             # update brains
@@ -298,10 +305,12 @@ class GameGUI2:
             # update gui
             self.update_gui(pos)
 
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         pass
+                    elif event.key == pygame.K_F3:
+                        self.compositor.toggle_debug()
                     elif event.key == pygame.K_LEFT:
                         self.move_character_to(direction='left')
                     elif event.key == pygame.K_RIGHT:
@@ -349,4 +358,4 @@ class GameGUI2:
                     elif self.exit_btn.clicked():
                         play_sfx('click')
                         self.is_running = False
-            pygame.display.update()
+            self.compositor.end_frame()
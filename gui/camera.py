@@ -0,0 +1,101 @@
+'''
+A camera over a grid of square tiles: which part of it a panel shows, and how big.
+
+A tile takes pitch pixels along each axis, a gap then the tile itself, so the
+tile (i, j) starts at pitch * (j, i) on the whole grid ("world" pixels); offset
+is the world pixel shown at the topleft of the viewport. Zooming moves between
+fixed pitches, so every size stays an integer number of pixels.
+'''
+import pygame
+
+
+class Camera:
+    def __init__(self, viewport: pygame.Rect, grid_shape: tuple[int, int], pitch: int, gap: int, zoom_levels: tuple[int, ...]) -> None:
+        '''
+        viewport: the rect of the screen the grid is shown in
+        grid_shape: rows and columns of tiles
+        pitch, gap: their sizes at the default zoom level
+        zoom_levels: the pitches one can zoom to
+        '''
+        assert pitch in zoom_levels, 'The default pitch must be one of the zoom levels'
+        self.viewport = pygame.Rect(viewport)
+        self.grid_shape = grid_shape
+        self.default_pitch = pitch
+        self.default_gap = gap
+        self.zoom_levels = sorted(zoom_levels)
+        self.pitch = pitch
+        self.offset = (0, 0)
+        self.clamp()
+
+    @property
+    def gap(self) -> int:
+        return max(1, round(self.pitch * self.default_gap / self.default_pitch))
+
+    @property
+    def tile_size(self) -> int:
+        return self.pitch - self.gap
+
+    def scaled(self, length: int, minimum: int = 0) -> int:
+        '''A length in pixels at the default zoom level, at the current one'''
+        return max(minimum, round(length * self.tile_size / (self.default_pitch - self.default_gap)))
+
+    @property
+    def world_size(self) -> tuple[int, int]:
+        rows, cols = self.grid_shape
+        return cols * self.pitch + self.gap, rows * self.pitch + self.gap
+
+    @property
+    def state(self) -> tuple[int, tuple[int, int]]:
+        '''Changes whenever what the viewport shows moves or is resized'''
+        return self.pitch, self.offset
+
+    def clamp(self):
+        '''Keeps the grid in view: centered if it is smaller than the viewport, filling it otherwise'''
+        self.offset = tuple(
+            min(max(offset, 0), world - view) if world > view else (world - view) // 2
+            for offset, world, view in zip(self.offset, self.world_size, self.viewport.size)
+        )
+
+    def pan(self, dx: int, dy: int):
+        '''Drags the grid by (dx, dy) screen pixels'''
+        self.offset = self.offset[0] - dx, self.offset[1] - dy
+        self.clamp()
+
+    def zoom(self, steps: int, anchor: tuple[int, int] | None = None):
+        '''Zooms in (steps > 0) or out by that many zoom levels, keeping the point under anchor
+        (a screen position, the center of the viewport by default) in place'''
+        level = min(max(self.zoom_levels.index(self.pitch) + steps, 0), len(self.zoom_levels) - 1)
+        pitch = self.zoom_levels[level]
+        anchor = anchor or self.viewport.center
+        ax, ay = anchor[0] - self.viewport.x, anchor[1] - self.viewport.y
+        self.offset = (self.offset[0] + ax) * pitch // self.pitch - ax, (self.offset[1] + ay) * pitch // self.pitch - ay
+        self.pitch = pitch
+        self.clamp()
+
+    def reset(self):
+        self.pitch = self.default_pitch
+        self.offset = (0, 0)
+        self.clamp()
+
+    def tiles_in(self, rect: pygame.Rect) -> tuple[range, range]:
+        '''The rows and the columns of the tiles in a rect relative to the viewport, even partly'''
+        (rows, cols), (ox, oy) = self.grid_shape, self.offset
+        return (range(max(0, (oy + rect.top) // self.pitch), min(rows, (oy + rect.bottom) // self.pitch + 1)),
+                range(max(0, (ox + rect.left) // self.pitch), min(cols, (ox + rect.right) // self.pitch + 1)))
+
+    def visible_tiles(self) -> tuple[range, range]:
+        '''The rows and the columns of the tiles in view, even partly'''
+        return self.tiles_in(pygame.Rect((0, 0), self.viewport.size))
+
+    def tile_rect(self, i: int, j: int, inset: int = 0) -> pygame.Rect:
+        '''Rect of a tile relative to the viewport, shrunk by inset pixels on every side'''
+        return pygame.Rect(self.pitch * j + self.gap - self.offset[0] + inset, self.pitch * i + self.gap - self.offset[1] + inset,
+                           self.tile_size - 2 * inset, self.tile_size - 2 * inset)
+
+    def tile_at(self, pos: tuple[int, int]) -> tuple[int, int] | None:
+        '''The tile under a screen position (a gap belongs to the tile after it); None if there is none'''
+        i = (pos[1] - self.viewport.y + self.offset[1]) // self.pitch
+        j = (pos[0] - self.viewport.x + self.offset[0]) // self.pitch
+        if 0 <= i < self.grid_shape[0] and 0 <= j < self.grid_shape[1]:
+            return i, j
+        return None
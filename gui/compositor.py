@@ -0,0 +1,121 @@
+'''
+Dirty-rectangle updates of the display.
+
+The screens still draw their whole frame onto the display surface every frame,
+but only the parts that changed are sent to the window. Everything drawn onto
+the surface is marked with a key (usually the object drawing it), the rect it
+covers and a state describing how it looks. At the end of the frame, the rects
+of what was new, changed, moved or gone since the last frame are the only ones
+passed to pygame.display.update.
+'''
+from typing import Any, Hashable
+
+import pygame
+
+from gui.gui_utils import BLACK, FONT_SMALL, RED, WHITE
+from gui.text_cache import TEXT_CACHE
+
+FULL_UPDATE_FRACTION = 0.5 # of the screen: updating more than that at once costs as much as a full update
+
+_compositors: dict[pygame.Surface, 'Compositor'] = {}
+
+
+class Compositor:
+    def __init__(self, surface: pygame.Surface, background: str = BLACK) -> None:
+        self.surface = surface
+        self.background = background
+        self.screen_rect = surface.get_rect()
+        self.debug = False # outlines the updated rects on the screen
+        self.last_rects: list[pygame.Rect] = [] # sent to the window in the last frame
+        self._drawn: dict[Hashable, tuple[pygame.Rect, Any]] = {}
+        self._last_drawn: dict[Hashable, tuple[pygame.Rect, Any]] = {}
+        self._invalid: list[pygame.Rect] = []
+        self._full_update = True # the window shows nothing of this surface yet
+        self._invalidated = False
+        self._overlay_rects: list[pygame.Rect] = []
+
+    def begin_frame(self):
+        '''Clears the surface; everything drawn until end_frame should be marked'''
+        if self._invalidated:
+            self._full_update, self._invalidated = True, False
+        self.surface.fill(self.background)
+        self._drawn = {}
+
+    def mark(self, key: Hashable, rect: pygame.Rect, state: Any = None):
+        '''Something was drawn into rect; state: anything comparable that describes how it looks'''
+        self._drawn[key] = pygame.Rect(rect), state
+
+    def invalidate(self, rect: pygame.Rect | None = None):
+        '''The rect has to be sent to the window this frame; the whole screen in the next frame if None'''
+        if rect is None:
+            self._invalidated = True
+        else:
+            self._invalid.append(pygame.Rect(rect))
+
+    def _dirty_rects(self) -> list[pygame.Rect]:
+        rects = self._invalid
+        for key, (rect, state) in self._drawn.items():
+            last = self._last_drawn.pop(key, None)
+            if last is None:
+                rects.append(rect)
+            elif last[0] != rect or last[1] != state:
+                rects += [rect, last[0]]
+        rects += [rect for rect, _ in self._last_drawn.values()] # not drawn anymore
+        unique = {tuple(rect.clip(self.screen_rect)) for rect in rects}
+        return [pygame.Rect(rect) for rect in unique if rect[2] and rect[3]]
+
+    def _draw_overlay(self, rects: list[pygame.Rect], full_update: bool) -> list[pygame.Rect]:
+        '''Outlines the rects, writes the share of the screen they cover and the use of the
+        text cache; returns what it drew over'''
+        for rect in rects:
+            pygame.draw.rect(self.surface, RED, rect, width=1)
+        text = 'full update' if full_update else f'{len(rects)} rects, {100 * self.fraction_updated:.1f}% of the screen'
+        text_stats = TEXT_CACHE.stats
+        text += f' | text cache: {100 * text_stats["hit_rate"]:.1f}% hits, {text_stats["surfaces"]} surfaces, {text_stats["bytes"] / 2**20:.2f} MB'
+        text_surface = FONT_SMALL.render(text, True, WHITE, BLACK)
+        text_rect = self.surface.blit(text_surface, text_surface.get_rect(bottomright=self.screen_rect.bottomright))
+        return rects + [text_rect]
+
+    def end_frame(self) -> list[pygame.Rect]:
+        '''Sends the changed parts of the frame to the window; returns their rects'''
+        rects = self._dirty_rects()
+        self._last_drawn, self._drawn = self._drawn, {}
+        self._invalid = []
+        full_update = self._full_update or self._area(rects) > FULL_UPDATE_FRACTION * self._area([self.screen_rect])
+        self._full_update = False
+        self.last_rects = [self.screen_rect.copy()] if full_update else rects
+        overlay_rects = self._draw_overlay(rects, full_update) if self.debug else []
+        pygame.display.update(self.last_rects + self._overlay_rects + overlay_rects) # the last overlay is erased too
+        self._overlay_rects = overlay_rects
+        return self.last_rects
+
+    @staticmethod
+    def _area(rects: list[pygame.Rect]) -> int:
+        return sum(rect.width * rect.height for rect in rects)
+
+    @property
+    def fraction_updated(self) -> float:
+        '''Share of the screen sent to the window in the last frame (overlapping rects counted twice)'''
+        return self._area(self.last_rects) / self._area([self.screen_rect])
+
+    def toggle_debug(self):
+        self.debug = not self.debug
+
+
+def get_compositor(surface: pygame.Surface) -> Compositor:
+    '''The compositor of a surface (created with the first call), shared by all the screens drawing on it'''
+    if surface not in _compositors:
+        _compositors[surface] = Compositor(surface)
+    return _compositors[surface]
+
+
+def mark(surface: pygame.Surface, key: Hashable, rect: pygame.Rect, state: Any = None):
+    '''Compositor.mark for whatever draws onto a surface; does nothing if it has no compositor'''
+    if surface in _compositors:
+        _compositors[surface].mark(key, rect, state)
+
+
+def invalidate(surface: pygame.Surface, rect: pygame.Rect | None = None):
+    '''Compositor.invalidate for whatever draws onto a surface; does nothing if it has no compositor'''
+    if surface in _compositors:
+        _compositors[surface].invalidate(rect)
@@ -0,0 +1,42 @@
+'''
+Pacing of the run loops.
+
+The loops run at FRAMERATE while the player interacts, and drop to
+IDLE_FRAMERATE once nothing happened for IDLE_AFTER_MS. When idle, the loop
+sleeps in pygame.event.wait instead of spinning, so any input wakes it at once.
+'''
+import pygame
+
+from gui.gui_utils import FRAMERATE, IDLE_AFTER_MS, IDLE_FRAMERATE
+
+
+class FrameScheduler:
+    def __init__(self, framerate: int = FRAMERATE, idle_framerate: int = IDLE_FRAMERATE, idle_after_ms: int = IDLE_AFTER_MS) -> None:
+        self.framerate = framerate
+        self.idle_framerate = idle_framerate
+        self.idle_after_ms = idle_after_ms
+        self.clock = pygame.time.Clock()
+        self._last_activity = pygame.time.get_ticks()
+
+    @property
+    def idle(self) -> bool:
+        return pygame.time.get_ticks() - self._last_activity > self.idle_after_ms
+
+    def wake(self):
+        '''Keeps the full frame rate for a while; call it every frame something moves
+        on its own (a dragged letter, a notification counting down)'''
+        self._last_activity = pygame.time.get_ticks()
+
+    def next_frame(self) -> list[pygame.event.Event]:
+        '''Waits until the next frame is due, or for input when idle; returns the events that came in'''
+        if self.idle:
+            event = pygame.event.wait(1000 // self.idle_framerate)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            self.clock.tick()
+        else:
+            self.clock.tick(self.framerate)
+            events = []
+        events += pygame.event.get()
+        if events:
+            self.wake()
+        return events
@@ -8,6 +8,7 @@ from typing import Optional
 
 import pygame
 
+from gui.compositor import mark
 from gui.gui_rect import Label, Panel
 from gui.gui_utils import FONT_NORM, FONT_SMALL, WHITE, WINDOW_SIZE
 
@@ -59,7 +60,9 @@ class GUICircle(ABC):
     @abstractmethod
     def draw(self) -> None:
         if self.visible:
-            pygame.draw.circle(self.surface, self.color_frame, self.center, self.radius, width=2 if self.hovering else 1)
+            width = 2 if self.hovering else 1
+            mark(self.surface, self, pygame.draw.circle(self.surface, self.color_frame, self.center, self.radius, width=width),
+                 (self.color_frame, width))
 
     @abstractmethod
     def update(self, current_mouse_pos: tuple[int, int]):
@@ -96,13 +99,15 @@ class ProgressCircle(GUICircle):
         self.k = int(self.progress * self.RESOLUTION)
 
     def draw(self) -> None:
+        drawn = pygame.Rect(self.center, (0, 0))
         for i in range(self.k):
             theta = 2 * math.pi * i / self.RESOLUTION - math.pi * 0.5
-            pygame.draw.line(
+            drawn = drawn.union(pygame.draw.line(
                 self.surface, WHITE, self.center,
                 (self.center[0] + self.radius * math.cos(theta) * 0.8, self.center[1] + self.radius * math.sin(theta) * 0.8),
                 width=3
-            )
+            ))
+        mark(self.surface, (self, 'progress'), drawn, self.k)
         return super().draw()
     
     def update(self, current_mouse_pos: tuple[int, int]):
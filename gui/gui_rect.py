@@ -8,7 +8,9 @@ import pygame
 
 from gui.gui_utils import FONT_NORM
 
+from .compositor import mark
 from .gui_utils import BLACK, CP0, FONT_BIG, FONT_SMALL, FONT_NORM, GREY, WHITE, shift, WINDOW_SIZE
+from .text_cache import render_text
 
 
 class Label:
@@ -18,20 +20,23 @@ class Label:
         self.font = font
         self.color = color
 
-        self.text_surface = self.font.render(self.text, True, self.color)
+        self.text_surface = render_text(self.font, self.text, self.color)
+        self.rendered = self.text, self.color # what text_surface shows
         self.rect = self.text_surface.get_rect(**kwargs)
         self.active = True
 
     def update(self):
         if self.active:
-            self.text_surface = self.font.render(self.text, True, self.color)
+            if self.rendered != (self.text, self.color):
+                self.text_surface = render_text(self.font, self.text, self.color)
+                self.rendered = self.text, self.color
             self.draw()
 
     def deactivate(self):
         self.active = False
 
     def draw(self):
-        self.surface.blit(self.text_surface, self.rect)
+        mark(self.surface, self, self.surface.blit(self.text_surface, self.rect), (self.text, self.color, self.font))
     
     def set_text(self, set_to: str) -> None:
         self.text = set_to
@@ -101,7 +106,9 @@ class GUIRect(ABC):
     @abstractmethod
     def draw(self) -> None:
         if self.visible:
-            pygame.draw.rect(self.surface, self.color_frame, self.rect, width=4 if self.hovering else 2, border_radius=3)
+            width = 4 if self.hovering else 2
+            mark(self.surface, self, pygame.draw.rect(self.surface, self.color_frame, self.rect, width=width, border_radius=3),
+                 (self.color_frame, width))
 
     def set_text(self, set_to: str) -> None:
         self.text_label.set_text(set_to)
@@ -209,7 +216,7 @@ class ProgressBar(GUIRect):
     
     def draw(self) -> None:
         if self.visible:
-            pygame.draw.rect(self.surface, GREY, self.progress_rect, border_radius=3)
+            mark(self.surface, (self, 'progress'), pygame.draw.rect(self.surface, GREY, self.progress_rect, border_radius=3))
         return super().draw()
 
 
@@ -309,7 +316,7 @@ class Notification(Panel):
     def draw(self) -> None:
         super().draw()
         if self.visible:
-            pygame.draw.rect(self.surface, WHITE, self.inner_rect, border_radius=3)
+            mark(self.surface, (self, 'inner'), pygame.draw.rect(self.surface, WHITE, self.inner_rect, border_radius=3))
     
     def update(self, current_mouse_pos: tuple[int, int]):
         self.draw()
@@ -3,6 +3,8 @@ import pathlib
 import pygame
 
 FRAMERATE = 60
+IDLE_FRAMERATE = 2 # once nothing happened for IDLE_AFTER_MS
+IDLE_AFTER_MS = 1000
 
 WHITE = '#FFFFFF'
 BLACK = '#000000'
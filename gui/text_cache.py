@@ -0,0 +1,68 @@
+'''
+A shared cache of rendered text.
+
+Most of the text on the screens (captions, hints, labels) is the same from one
+frame to the next, so its surfaces are kept and reused instead of being
+rendered again. The least recently used ones are dropped once the cache holds
+more than TEXT_CACHE_MAX_BYTES of pixels. The surfaces are shared: blit them,
+never draw on them.
+'''
+from collections import OrderedDict
+from typing import Hashable
+
+import pygame
+
+TEXT_CACHE_MAX_BYTES = 16 * 2**20
+
+
+class TextCache:
+    def __init__(self, max_bytes: int = TEXT_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._surfaces: OrderedDict[Hashable, pygame.Surface] = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+        '''font.render(text, antialias, color), from the cache if it was rendered before'''
+        key = font, text, tuple(color) if isinstance(color, list) else color, antialias
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        self.bytes += self._size(surface)
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, dropped = self._surfaces.popitem(last=False)
+            self.bytes -= self._size(dropped)
+        return surface
+
+    @staticmethod
+    def _size(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.,
+            'surfaces': len(self._surfaces),
+            'bytes': self.bytes,
+        }
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+    '''TextCache.render with the cache shared by all the gui objects'''
+    return TEXT_CACHE.render(font, text, color, antialias)
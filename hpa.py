@@ -0,0 +1,187 @@
+'''
+Hierarchical pathfinding (HPA*) over a maze grid.
+
+The grid is split into square clusters. Every pair of neighboring passable tiles
+on the two sides of a cluster border is an entrance, and the tiles of the
+entrances are the nodes of an abstract graph. Nodes of the same cluster are
+linked by their distances inside the cluster, computed once per cluster and
+cached. Long-range queries run Dijkstra on the abstract graph, touching only
+the clusters they go through; only the first leg is refined to tiles, which is
+all a movement hint needs.
+
+Mazes have few border crossings, so every one of them is kept: the distances
+are then exact (any shortest path is a chain of in-cluster legs between them).
+'''
+from collections import deque
+import heapq
+
+import numpy as np
+
+
+class HierarchicalPathfinder:
+    def __init__(self, passable: np.ndarray, targets: np.ndarray | None = None, cluster_size: int = 16) -> None:
+        '''
+        passable: bool grid, True for the tiles one can stand on (the border must be walls)
+        targets: bool grid of the tiles nearest_target_distance looks for (e.g. the items)
+        cluster_size: side of the square clusters, in tiles
+        '''
+        assert cluster_size >= 2, 'Clusters must be at least 2x2'
+        self.shape: tuple[int, int] = passable.shape
+        self.cluster_size = cluster_size
+        h, w = self.shape
+        self.cluster_cols = -(-w // cluster_size)
+        self.offsets = (-w, w, -1, 1)
+        self.passable = bytearray(passable.ravel().astype(np.uint8).tobytes())
+        self.targets = bytearray(passable.size) if targets is None else bytearray((passable & targets).ravel().astype(np.uint8).tobytes())
+        ii, jj = np.indices(self.shape)
+        self.cluster_ids: list[int] = ((ii // cluster_size) * self.cluster_cols + jj // cluster_size).ravel().tolist()
+
+        # entrances: the tiles right before and right after every cluster border, where both are passable
+        sources, sinks = [], []
+        for border in range(cluster_size - 1, w - 1, cluster_size): # vertical borders
+            ii = np.flatnonzero(passable[:, border] & passable[:, border + 1])
+            sources.append(ii * w + border)
+            sinks.append(ii * w + border + 1)
+        for border in range(cluster_size - 1, h - 1, cluster_size): # horizontal borders
+            jj = np.flatnonzero(passable[border, :] & passable[border + 1, :])
+            sources.append(border * w + jj)
+            sinks.append((border + 1) * w + jj)
+        sources = np.concatenate(sources).tolist() if sources else []
+        sinks = np.concatenate(sinks).tolist() if sinks else []
+
+        self.crossings: dict[int, list[int]] = {} # node: nodes of the neighboring clusters, 1 step away
+        for a, b in zip(sources, sinks):
+            self.crossings.setdefault(a, []).append(b)
+            self.crossings.setdefault(b, []).append(a)
+        self.cluster_nodes: dict[int, list[int]] = {}
+        for node in sorted(self.crossings):
+            self.cluster_nodes.setdefault(self.cluster_of(node), []).append(node)
+
+        # cluster: ({node: [(other node, distance)]}, {node: distance to the closest target, -1 if none})
+        self._cache: dict[int, tuple[dict[int, list[tuple[int, int]]], dict[int, int]]] = {}
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.crossings)
+
+    def cluster_of(self, cell: int) -> int:
+        return self.cluster_ids[cell]
+
+    def _flat(self, tile: tuple[int, int]) -> int:
+        return tile[0] * self.shape[1] + tile[1]
+
+    def _tile(self, cell: int) -> tuple[int, int]:
+        return divmod(cell, self.shape[1])
+
+    def _local_bfs(self, source: int) -> tuple[dict[int, int], dict[int, int]]:
+        '''BFS from a tile that never leaves its cluster: distances and parents of the reached tiles'''
+        passable, cluster_ids = self.passable, self.cluster_ids
+        cluster = cluster_ids[source]
+        dist, parents = {source: 0}, {source: -1}
+        queue = deque([source])
+        while queue:
+            cell = queue.popleft()
+            d = dist[cell] + 1
+            for off in self.offsets:
+                n = cell + off
+                if passable[n] and cluster_ids[n] == cluster and n not in dist:
+                    dist[n] = d
+                    parents[n] = cell
+                    queue.append(n)
+        return dist, parents
+
+    def _closest_target(self, dist: dict[int, int]) -> int:
+        return min((d for cell, d in dist.items() if self.targets[cell]), default=-1)
+
+    def _cluster(self, cluster: int) -> tuple[dict[int, list[tuple[int, int]]], dict[int, int]]:
+        '''Distances between the nodes of a cluster, and from them to the closest target (cached)'''
+        if cluster not in self._cache:
+            nodes = self.cluster_nodes.get(cluster, [])
+            intra, to_target = {}, {}
+            for node in nodes:
+                dist, _ = self._local_bfs(node)
+                intra[node] = [(other, dist[other]) for other in nodes if other != node and other in dist]
+                to_target[node] = self._closest_target(dist)
+            self._cache[cluster] = intra, to_target
+        return self._cache[cluster]
+
+    def invalidate(self, i: int, j: int):
+        '''Forgets the cached distances of the cluster of a tile'''
+        self._cache.pop(self.cluster_of(self._flat((i, j))), None)
+
+    def set_target(self, i: int, j: int, is_target: bool):
+        cell = self._flat((i, j))
+        if self.targets[cell] != is_target:
+            self.targets[cell] = is_target
+            self.invalidate(i, j)
+
+    def _search(self, seeds: dict[int, int], ends: dict[int, int] | None = None, best: int = -1):
+        '''Dijkstra on the abstract graph from seeded nodes. Reaching a node of ends costs
+        the extra distance given there; if ends is None, the extra distance is the one
+        to the closest target. best is a known candidate to beat (-1 if none).
+
+        Returns: the best distance, the node it ends at (-1 if it is the candidate) and the parents'''
+        dist = dict(seeds)
+        parents = {node: -1 for node in seeds}
+        queue = [(d, node) for node, d in seeds.items()]
+        heapq.heapify(queue)
+        settled, best_node = set(), -1
+        while queue:
+            d, node = heapq.heappop(queue)
+            if node in settled:
+                continue
+            if best >= 0 and d >= best:
+                break
+            settled.add(node)
+            intra, to_target = self._cluster(self.cluster_of(node))
+            extra = to_target[node] if ends is None else ends.get(node, -1)
+            if extra >= 0 and (best < 0 or d + extra < best):
+                best, best_node = d + extra, node
+            for other, weight in intra[node] + [(other, 1) for other in self.crossings[node]]:
+                nd = d + weight
+                if other not in dist or nd < dist[other]:
+                    dist[other] = nd
+                    parents[other] = node
+                    heapq.heappush(queue, (nd, other))
+        return best, best_node, parents
+
+    def _route(self, start: int, end: int) -> tuple[int, list[int], dict[int, int]]:
+        '''Distance, abstract nodes on the way (start and end excluded) and the
+        parents of the local BFS from start'''
+        from_start, start_parents = self._local_bfs(start)
+        from_end, _ = self._local_bfs(end)
+        seeds = {node: from_start[node] for node in self.cluster_nodes.get(self.cluster_of(start), []) if node in from_start}
+        ends = {node: from_end[node] for node in self.cluster_nodes.get(self.cluster_of(end), []) if node in from_end}
+        best, node, parents = self._search(seeds, ends, from_start.get(end, -1))
+        waypoints = []
+        while node >= 0:
+            waypoints.append(node)
+            node = parents[node]
+        return best, waypoints[::-1], start_parents
+
+    def distance(self, a: tuple[int, int], b: tuple[int, int]) -> int:
+        '''Length of the shortest path between two passable tiles; -1 if they are not connected'''
+        return self._route(self._flat(a), self._flat(b))[0]
+
+    def route(self, a: tuple[int, int], b: tuple[int, int]) -> list[tuple[int, int]]:
+        '''Abstract route from a to b: the tiles where the shortest path crosses cluster borders
+        (a and b included); [] if they are not connected'''
+        d, waypoints, _ = self._route(self._flat(a), self._flat(b))
+        return [a] + [self._tile(c) for c in waypoints] + [b] if d >= 0 else []
+
+    def first_leg(self, a: tuple[int, int], b: tuple[int, int]) -> list[tuple[int, int]]:
+        '''Tiles of the shortest path from a up to its first border crossing (or to b if it
+        never leaves the cluster of a), both included; [] if b cannot be reached'''
+        d, waypoints, parents = self._route(self._flat(a), self._flat(b))
+        if d < 0:
+            return []
+        leg = [waypoints[0] if waypoints else self._flat(b)]
+        while parents[leg[-1]] >= 0:
+            leg.append(parents[leg[-1]])
+        return [self._tile(c) for c in reversed(leg)]
+
+    def nearest_target_distance(self, a: tuple[int, int]) -> int:
+        '''Number of steps to the closest target tile; -1 if none can be reached'''
+        from_start, _ = self._local_bfs(self._flat(a))
+        seeds = {node: from_start[node] for node in self.cluster_nodes.get(self.cluster_of(self._flat(a)), []) if node in from_start}
+        return self._search(seeds, best=self._closest_target(from_start))[0]
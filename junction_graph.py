@@ -0,0 +1,212 @@
+'''
+A maze grid contracted to a small weighted graph.
+
+Perfect mazes are mostly long corridors of tiles with exactly two passable
+neighbors. Only junctions, dead ends and key tiles (e.g. items) become nodes;
+every corridor between two nodes becomes one edge, weighted by its length.
+Path and distance queries run Dijkstra on this graph, and paths are expanded
+back to tiles only when asked for.
+'''
+import heapq
+
+import numpy as np
+
+
+class JunctionGraph:
+    def __init__(self, passable: np.ndarray, key_mask: np.ndarray | None = None) -> None:
+        '''
+        passable: bool grid, True for the tiles one can stand on (the border must be walls)
+        key_mask: tiles that have to stay nodes of the graph, whatever their shape
+        '''
+        self.shape: tuple[int, int] = passable.shape
+        w = self.shape[1]
+        self.offsets = (-w, w, -1, 1)
+
+        degree = np.zeros(self.shape, dtype=np.int8)
+        degree[1:, :] += passable[:-1, :]
+        degree[:-1, :] += passable[1:, :]
+        degree[:, 1:] += passable[:, :-1]
+        degree[:, :-1] += passable[:, 1:]
+        key = passable & (degree != 2)
+        if key_mask is not None:
+            key |= passable & key_mask
+
+        self.passable = bytearray(passable.ravel().astype(np.uint8).tobytes())
+        self.is_key = bytearray(key.ravel().astype(np.uint8).tobytes())
+        # every corridor tile knows its edge, and its position along it
+        self.corridor = [-1] * len(self.passable)
+        self.corridor_pos = [-1] * len(self.passable)
+        # edges as (node, other node, corridor tiles from node to other node, both excluded)
+        self.edges: list[tuple[int, int, list[int]]] = []
+        self.adjacency: dict[int, list[tuple[int, int, int]]] = {} # node: [(other node, weight, edge id)]
+
+        for node in np.flatnonzero(key).tolist():
+            self._trace_from(node)
+        # corridors closed into a loop have no node on them: promote one tile of each
+        for cell in np.flatnonzero(passable.ravel()).tolist():
+            if not self.is_key[cell] and self.corridor[cell] < 0:
+                self.is_key[cell] = 1
+                self._trace_from(cell)
+
+    def _trace_from(self, node: int):
+        self.adjacency.setdefault(node, [])
+        for off in self.offsets:
+            cell = node + off
+            if not self.passable[cell]:
+                continue
+            if not self.is_key[cell] and self.corridor[cell] >= 0:
+                continue # this corridor was already traced from its other end
+            if self.is_key[cell] and cell < node:
+                continue # same for two neighboring nodes
+            cells, prev = [], node
+            while not self.is_key[cell]:
+                cells.append(cell)
+                for n_off in self.offsets:
+                    n = cell + n_off
+                    if n != prev and self.passable[n]:
+                        prev, cell = cell, n
+                        break
+            self._add_edge(node, cell, cells)
+
+    def _add_edge(self, u: int, v: int, cells: list[int]):
+        edge_id = len(self.edges)
+        self.edges.append((u, v, cells))
+        for pos, cell in enumerate(cells):
+            self.corridor[cell] = edge_id
+            self.corridor_pos[cell] = pos
+        self.adjacency.setdefault(u, []).append((v, len(cells) + 1, edge_id))
+        if u != v:
+            self.adjacency.setdefault(v, []).append((u, len(cells) + 1, edge_id))
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.adjacency)
+
+    def _flat(self, tile: tuple[int, int]) -> int:
+        return tile[0] * self.shape[1] + tile[1]
+
+    def _tile(self, cell: int) -> tuple[int, int]:
+        return divmod(cell, self.shape[1])
+
+    def _attach(self, cell: int) -> list[tuple[int, int]]:
+        '''Nodes a tile is attached to, with the distances to them'''
+        if self.is_key[cell]:
+            return [(cell, 0)]
+        u, v, cells = self.edges[self.corridor[cell]]
+        pos = self.corridor_pos[cell]
+        return [(u, pos + 1), (v, len(cells) - pos)]
+
+    def _walk(self, cell: int, node: int) -> list[int]:
+        '''Tiles from a tile (excluded) to one of the nodes it is attached to (included)'''
+        if cell == node:
+            return []
+        u, v, cells = self.edges[self.corridor[cell]]
+        pos = self.corridor_pos[cell]
+        if node == u and (u != v or pos + 1 <= len(cells) - pos):
+            return cells[pos - 1::-1] + [u] if pos else [u]
+        return cells[pos + 1:] + [v]
+
+    def _targets(self, cell: int) -> dict[int, int]:
+        targets = {}
+        for node, d in self._attach(cell):
+            targets[node] = min(d, targets.get(node, d))
+        return targets
+
+    def _edge_tiles(self, edge_id: int, from_node: int) -> list[int]:
+        '''Tiles of an edge walked from one of its nodes (excluded) to the other (included)'''
+        u, v, cells = self.edges[edge_id]
+        return cells + [v] if from_node == u else cells[::-1] + [u]
+
+    def _dijkstra(self, start: int, targets: dict[int, int] | None = None, is_target=None):
+        '''Dijkstra from a tile, stopping as soon as the best target is settled.
+        Targets are either nodes with extra costs to add, or nodes satisfying is_target.
+
+        Returns: the best (distance, node) and the parents of the settled nodes'''
+        dist, parents = {}, {}
+        queue = []
+        for node, d in self._attach(start):
+            if d < dist.get(node, d + 1):
+                dist[node] = d
+                parents[node] = None
+                heapq.heappush(queue, (d, node))
+        best = (-1, -1)
+        settled = set()
+        while queue:
+            d, node = heapq.heappop(queue)
+            if node in settled:
+                continue
+            if best[0] >= 0 and d >= best[0]:
+                break
+            settled.add(node)
+            if targets is not None and node in targets:
+                if best[0] < 0 or d + targets[node] < best[0]:
+                    best = (d + targets[node], node)
+            elif is_target is not None and is_target(self._tile(node)):
+                best = (d, node)
+                break
+            for other, weight, edge_id in self.adjacency[node]:
+                nd = d + weight
+                if other not in dist or nd < dist[other]:
+                    dist[other] = nd
+                    parents[other] = (node, edge_id)
+                    heapq.heappush(queue, (nd, other))
+        return best, parents
+
+    def _expand(self, start: int, parents: dict, node: int) -> list[int]:
+        '''Tiles from start (included) to a settled node (included)'''
+        chunks = []
+        while parents[node] is not None:
+            prev, edge_id = parents[node]
+            chunks.append(self._edge_tiles(edge_id, prev))
+            node = prev
+        path = [start] + self._walk(start, node)
+        for chunk in reversed(chunks):
+            path += chunk
+        return path
+
+    def _same_corridor(self, a: int, b: int) -> int:
+        '''Distance between two tiles straight along their common corridor; -1 if there is none'''
+        if self.is_key[a] or self.is_key[b] or self.corridor[a] != self.corridor[b]:
+            return -1
+        return abs(self.corridor_pos[a] - self.corridor_pos[b])
+
+    def distance(self, a: tuple[int, int], b: tuple[int, int]) -> int:
+        '''Length of the shortest path between two passable tiles; -1 if they are not connected'''
+        start, end = self._flat(a), self._flat(b)
+        if start == end:
+            return 0
+        (d, _), _ = self._dijkstra(start, targets=self._targets(end))
+        direct = self._same_corridor(start, end)
+        if direct >= 0 and (d < 0 or direct < d):
+            return direct
+        return d
+
+    def shortest_path(self, a: tuple[int, int], b: tuple[int, int]) -> list[tuple[int, int]]:
+        '''Tiles of the shortest path from a to b, both included; [] if they are not connected'''
+        start, end = self._flat(a), self._flat(b)
+        if start == end:
+            return [a]
+        (d, node), parents = self._dijkstra(start, targets=self._targets(end))
+        direct = self._same_corridor(start, end)
+        if direct >= 0 and (d < 0 or direct <= d):
+            cells = self.edges[self.corridor[start]][2]
+            first, last = self.corridor_pos[start], self.corridor_pos[end]
+            step = 1 if last > first else -1
+            return [self._tile(cells[pos]) for pos in range(first, last + step, step)]
+        if d < 0:
+            return []
+        path = self._expand(start, parents, node)
+        if node != end:
+            path += reversed([end] + self._walk(end, node)[:-1])
+        return [self._tile(c) for c in path]
+
+    def nearest(self, a: tuple[int, int], is_target) -> list[tuple[int, int]]:
+        '''Tiles of the shortest path from a to the closest node tile satisfying is_target
+        (only nodes are considered, see key_mask); [] if there is none'''
+        start = self._flat(a)
+        if self.is_key[start] and is_target(a):
+            return [a]
+        (_, node), parents = self._dijkstra(start, is_target=is_target)
+        if node < 0:
+            return []
+        return [self._tile(c) for c in self._expand(start, parents, node)]
@@ -1,6 +1,9 @@
+from multiprocessing import freeze_support
+
 from menu import MazeApp
 
 
 if __name__ == '__main__':
+    freeze_support() # the mazes of big games are built in worker processes, see Game
     maze_app = MazeApp()
     maze_app.run_menu()
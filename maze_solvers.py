@@ -0,0 +1,220 @@
+'''
+Maze-solving algorithms for maze_utils.Maze, working directly on the numpy grid
+(1 is wall, 0 is pass). Like in mazelib, a solution is a list of (r, c) cells
+leading from the start to the end, both excluded.
+'''
+
+
+import abc
+import heapq
+
+import numpy as np
+
+
+class MazeSolveAlgo:
+    __metaclass__ = abc.ABCMeta
+
+    def solve(self, grid, start, end):
+        """public method to solve a maze
+
+        Args:
+            grid (np.array): 2D maze grid, 1 is wall, 0 is pass
+            start (tuple): starting cell, may lie on the outer wall
+            end (tuple): ending cell, may lie on the outer wall
+        Returns:
+            list: all the solutions found, every one a list of (r, c) cells
+        """
+        self.H, self.W = grid.shape
+        # pad the grid with a ring of walls, so that neighbors of any cell
+        # are always +-1 and +-Wp away in flat indices, without bound checks
+        self.Wp = self.W + 2
+        passable = np.zeros((self.H + 2, self.Wp), dtype=bool)
+        passable[1:-1, 1:-1] = np.asarray(grid) == 0
+        passable[start[0] + 1, start[1] + 1] = True
+        passable[end[0] + 1, end[1] + 1] = True
+        self.passable = passable.reshape(-1)
+        self.offsets = np.array([-self.Wp, self.Wp, -1, 1])
+
+        path = self._solve(self._to_flat(start), self._to_flat(end))
+        if not path:
+            return []
+        return [[self._to_cell(p) for p in path[1:-1]]]
+
+    @abc.abstractmethod
+    def _solve(self, start, end):
+        """Find one shortest path between two flat indices of the padded grid.
+
+        Returns:
+            list: flat indices from start to end, both included ([] if there is no path)
+        """
+        return None
+
+    def prune_solutions(self, solutions):
+        """Drop empty and duplicate solutions, and order the rest from the shortest.
+
+        Args:
+            solutions (list): multiple raw solutions
+        Returns:
+            list: the pruned solutions
+        """
+        unique = []
+        for sol in solutions:
+            if sol and sol not in unique:
+                unique.append(sol)
+        return sorted(unique, key=len)
+
+    """ All of the methods below this are helper methods,
+    common to many maze-solving algorithms.
+    """
+
+    def _to_flat(self, cell):
+        return (cell[0] + 1) * self.Wp + cell[1] + 1
+
+    def _to_cell(self, flat):
+        r, c = divmod(int(flat), self.Wp)
+        return (r - 1, c - 1)
+
+    def _expand(self, frontier, dist, d):
+        """Move a whole BFS wavefront one step, with vectorized boolean masks.
+
+        Args:
+            frontier (np.array): flat indices of the current wavefront
+            dist (np.array): distances so far, -1 for unvisited cells; updated in place
+            d (int): distance of the new wavefront
+        Returns:
+            np.array: flat indices of the new wavefront
+        """
+        ns = (frontier[:, None] + self.offsets).ravel()
+        ns = ns[self.passable[ns]]
+        ns = np.unique(ns[dist[ns] < 0])
+        dist[ns] = d
+        return ns
+
+    def _walk_down(self, dist, cell):
+        """Follow strictly decreasing distances from a cell down to the source (distance 0).
+
+        Returns:
+            list: flat indices from the cell to the source, both included
+        """
+        path = [int(cell)]
+        d = dist[cell]
+        while d > 0:
+            d -= 1
+            for off in self.offsets:
+                if dist[path[-1] + off] == d:
+                    path.append(int(path[-1] + off))
+                    break
+        return path
+
+
+class BFSSolver(MazeSolveAlgo):
+    """
+    The Algorithm
+
+    1. Grow a wavefront out of the start, one step at a time, recording
+        the distance of every cell reached.
+    2. Stop once the end is reached, or the wavefront dies out.
+    3. Walk back from the end along decreasing distances.
+
+    Every step expands the whole wavefront at once, with numpy.
+    """
+
+    def _solve(self, start, end):
+        dist = np.full(self.passable.size, -1, dtype=np.int32)
+        dist[start] = 0
+        frontier = np.array([start])
+        d = 0
+        while frontier.size and dist[end] < 0:
+            d += 1
+            frontier = self._expand(frontier, dist, d)
+        if dist[end] < 0:
+            return []
+        return self._walk_down(dist, end)[::-1]
+
+
+class BidirectionalBFSSolver(MazeSolveAlgo):
+    """
+    The Algorithm
+
+    1. Grow two wavefronts, one out of the start and one out of the end,
+        always expanding the smaller one by a whole step.
+    2. Once the wavefronts touch, pick the meeting cell with the smallest total distance.
+    3. Walk back from the meeting cell to both ends.
+    """
+
+    def _solve(self, start, end):
+        if start == end:
+            return [start]
+        dist_s = np.full(self.passable.size, -1, dtype=np.int32)
+        dist_e = np.full(self.passable.size, -1, dtype=np.int32)
+        dist_s[start] = 0
+        dist_e[end] = 0
+        front_s, front_e = np.array([start]), np.array([end])
+        d_s = d_e = 0
+
+        while front_s.size and front_e.size:
+            if front_s.size <= front_e.size:
+                d_s += 1
+                front_s = self._expand(front_s, dist_s, d_s)
+                met = front_s[dist_e[front_s] >= 0]
+            else:
+                d_e += 1
+                front_e = self._expand(front_e, dist_e, d_e)
+                met = front_e[dist_s[front_e] >= 0]
+            if met.size:
+                meet = met[np.argmin(dist_s[met] + dist_e[met])]
+                return self._walk_down(dist_s, meet)[::-1] + self._walk_down(dist_e, meet)[1:]
+        return []
+
+
+class AStarSolver(MazeSolveAlgo):
+    """
+    The Algorithm
+
+    1. Keep a priority queue of cells, ordered by the distance from the start
+        plus the Manhattan distance left to the end.
+    2. Pop the most promising cell, and push its neighbors if this is
+        the shortest way to them found so far.
+    3. Stop once the end is popped, and walk back along the recorded parents.
+    """
+
+    def _solve(self, start, end):
+        passable = memoryview(self.passable.view(np.uint8))
+        g = np.full(self.passable.size, -1, dtype=np.int32)
+        parent = np.full(self.passable.size, -1, dtype=np.int64)
+        g_mv, parent_mv = memoryview(g), memoryview(parent)
+        Wp = self.Wp
+        end_r, end_c = divmod(end, Wp)
+        offsets = (-Wp, Wp, -1, 1)
+
+        g_mv[start] = 0
+        queue = [(0, 0, start)]
+        while queue:
+            _, g_cur, cur = heapq.heappop(queue)
+            if cur == end:
+                break
+            if g_cur > g_mv[cur]:
+                continue  # stale entry
+            for off in offsets:
+                n = cur + off
+                if not passable[n]:
+                    continue
+                if g_mv[n] < 0 or g_cur + 1 < g_mv[n]:
+                    g_mv[n] = g_cur + 1
+                    parent_mv[n] = cur
+                    r, c = divmod(n, Wp)
+                    heapq.heappush(queue, (g_cur + 1 + abs(r - end_r) + abs(c - end_c), g_cur + 1, n))
+        else:
+            return []
+
+        path = [end]
+        while path[-1] != start:
+            path.append(parent_mv[path[-1]])
+        return path[::-1]
+
+
+SOLVERS = {
+    'bfs': BFSSolver,
+    'bidirectional': BidirectionalBFSSolver,
+    'astar': AStarSolver,
+}
@@ -5,11 +5,8 @@ see https://github.com/john-science/mazelib
 
 
 import abc
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-from numpy.random import shuffle
-from random import randrange
-
-from random import randrange
 
 
 class Maze:
@@ -19,6 +16,11 @@ class Maze:
     """
 
     def __init__(self, seed=None):
+        """
+        Args:
+            seed (int | np.random.SeedSequence | np.random.Generator): seed of the random
+                stream owned by this maze; it drives the generator and the entrances
+        """
         self.generator = None
         self.grid = None
         self.start = None
@@ -27,23 +29,18 @@ class Maze:
         self.solver = None
         self.solutions = None
         self.prune = True
-        Maze.set_seed(seed)
+        self.seed = seed
+        self.set_seed(seed)
 
-    @staticmethod
-    def set_seed(seed):
-        """helper method to set the random seeds for all the random seed for all the random libraries we are using
+    def set_seed(self, seed):
+        """helper method to reset the random stream of this maze.
+        No global random state is touched, so mazes can be built concurrently.
 
         Args:
-            seed (int): random seed number
+            seed (int | np.random.SeedSequence | np.random.Generator): random seed
         Returns: None
         """
-        if seed is not None:
-            import random
-
-            random.seed(seed)
-            import numpy as np
-
-            np.random.seed(seed)
+        self.rng = np.random.default_rng(seed)
 
     def generate(self):
         """public method to generate a new maze, and handle some clean-up
@@ -54,11 +51,42 @@ class Maze:
             self.generator is None
         ), "No maze-generation algorithm has been set."
 
+        self.generator.rng = self.rng
         self.grid = self.generator.generate()
         self.start = None
         self.end = None
         self.solutions = None
 
+    def generate_to_file(self, filename):
+        """public method to generate a new maze straight into a memory-mapped file,
+        for mazes too big to hold in memory. The generator has to support streaming.
+
+        Args:
+            filename (str): path of the .npy file to create
+        Returns: None
+        """
+        assert hasattr(
+            self.generator, "generate_memmap"
+        ), "This maze-generation algorithm cannot stream to a file."
+
+        self.generator.rng = self.rng
+        self.grid = self.generator.generate_memmap(filename)
+        self.start = None
+        self.end = None
+        self.solutions = None
+
+    def open_grid(self, filename):
+        """Open a maze grid saved as .npy, memory-mapped and read-only (nothing is copied).
+
+        Args:
+            filename (str): path of the .npy file
+        Returns: None
+        """
+        self.grid = np.load(filename, mmap_mode="r")
+        self.start = None
+        self.end = None
+        self.solutions = None
+
     def generate_entrances(self, start_outer=True, end_outer=True):
         """Generate maze entrances. Entrances can be on the walls, or inside the maze.
 
@@ -88,21 +116,21 @@ class Maze:
         H = self.grid.shape[0]
         W = self.grid.shape[1]
 
-        start_side = randrange(4)
+        start_side = _randrange(self.rng, 4)
 
         # maze entrances will be on opposite sides of the maze.
         if start_side == 0:
-            self.start = (0, randrange(1, W, 2))  # North
-            self.end = (H - 1, randrange(1, W, 2))
+            self.start = (0, _randrange(self.rng, 1, W, 2))  # North
+            self.end = (H - 1, _randrange(self.rng, 1, W, 2))
         elif start_side == 1:
-            self.start = (H - 1, randrange(1, W, 2))  # South
-            self.end = (0, randrange(1, W, 2))
+            self.start = (H - 1, _randrange(self.rng, 1, W, 2))  # South
+            self.end = (0, _randrange(self.rng, 1, W, 2))
         elif start_side == 2:
-            self.start = (randrange(1, H, 2), 0)  # West
-            self.end = (randrange(1, H, 2), W - 1)
+            self.start = (_randrange(self.rng, 1, H, 2), 0)  # West
+            self.end = (_randrange(self.rng, 1, H, 2), W - 1)
         else:
-            self.start = (randrange(1, H, 2), W - 1)  # East
-            self.end = (randrange(1, H, 2), 0)
+            self.start = (_randrange(self.rng, 1, H, 2), W - 1)  # East
+            self.end = (_randrange(self.rng, 1, H, 2), 0)
 
     def _generate_inner_entrances(self):
         """Generate maze entrances, randomly within the maze.
@@ -111,12 +139,12 @@ class Maze:
         """
         H, W = self.grid.shape
 
-        self.start = (randrange(1, H, 2), randrange(1, W, 2))
-        end = (randrange(1, H, 2), randrange(1, W, 2))
+        self.start = (_randrange(self.rng, 1, H, 2), _randrange(self.rng, 1, W, 2))
+        end = (_randrange(self.rng, 1, H, 2), _randrange(self.rng, 1, W, 2))
 
         # make certain the start and end points aren't the same
         while end == self.start:
-            end = (randrange(1, H, 2), randrange(1, W, 2))
+            end = (_randrange(self.rng, 1, H, 2), _randrange(self.rng, 1, W, 2))
 
         self.end = end
 
@@ -128,20 +156,20 @@ class Maze:
         """
         H, W = self.grid.shape
 
-        start_side = randrange(4)
+        start_side = _randrange(self.rng, 4)
 
         # pick a side for the outer maze entrance
         if start_side == 0:
-            first = (0, randrange(1, W, 2))  # North
+            first = (0, _randrange(self.rng, 1, W, 2))  # North
         elif start_side == 1:
-            first = (H - 1, randrange(1, W, 2))  # South
+            first = (H - 1, _randrange(self.rng, 1, W, 2))  # South
         elif start_side == 2:
-            first = (randrange(1, H, 2), 0)  # West
+            first = (_randrange(self.rng, 1, H, 2), 0)  # West
         else:
-            first = (randrange(1, H, 2), W - 1)  # East
+            first = (_randrange(self.rng, 1, H, 2), W - 1)  # East
 
         # create an inner maze entrance
-        second = (randrange(1, H, 2), randrange(1, W, 2))
+        second = (_randrange(self.rng, 1, H, 2), _randrange(self.rng, 1, W, 2))
 
         return (first, second)
 
@@ -204,6 +232,64 @@ class Maze:
         self.end = mazes[posi]["end"]
         self.solutions = mazes[posi]["solutions"]
 
+    def generate_monte_carlo_parallel(
+        self, repeat, entrances=3, difficulty=1.0, reducer=len, max_workers=None
+    ):
+        """Same as generate_monte_carlo, but the mazes are generated and solved
+        across a process pool.
+
+        Every trial gets its own seed, derived deterministically from the seed of
+        this maze, and workers only send back scores and seeds. The chosen maze is
+        then regenerated once here, so memory stays flat no matter how many trials run.
+        The generator, solver and reducer have to be picklable.
+
+        Args:
+            repeat (int): How many mazes do you want to generate?
+            entrances (int): How many different entrance combinations do you want to try?
+            difficulty (float): How difficult do you want the final maze to be (zero to one).
+            reducer (function): How do you want to determine solution difficulty (default is length).
+            max_workers (int): How many processes to use (default is one per core).
+        Returns: None
+        """
+        assert (
+            difficulty >= 0.0 and difficulty <= 1.0
+        ), "Maze difficulty must be between 0 to 1."
+        assert not (self.generator is None), "No maze-generation algorithm has been set."
+        assert not (self.solver is None), "No maze-solving algorithm has been set."
+        assert entrances >= 1, "At least one entrance combination has to be tried."
+
+        seeds = [
+            int(child.generate_state(1)[0])
+            for child in self.rng.bit_generator.seed_seq.spawn(repeat)
+        ]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            trials = list(
+                executor.map(
+                    _monte_carlo_trial,
+                    [self.generator] * repeat,
+                    [self.solver] * repeat,
+                    seeds,
+                    [entrances] * repeat,
+                    [reducer] * repeat,
+                )
+            )
+
+        # drop the trials where no entrance combination could be solved
+        trials = [trial for trial in trials if trial[0] != float("-inf")]
+        if not trials:
+            raise ValueError("No trial produced a solvable maze, try more repeats or entrances.")
+
+        # sort the mazes by the score of their solution, and pick by difficulty
+        trials = sorted(trials, key=lambda k: k[0])
+        _, seed, start, end = trials[int((len(trials) - 1) * difficulty)]
+
+        # regenerate the chosen maze, it is deterministic given its seed
+        self.set_seed(seed)
+        self.generate()
+        self.start = start
+        self.end = end
+        self.solve()
+
     def transmute(self):
         """transmute an existing maze grid
 
@@ -277,10 +363,42 @@ class Maze:
         return self.__str__()
 
 
+def _randrange(rng, start, stop=None, step=1):
+    """random.randrange, drawn from the given numpy random Generator"""
+    if stop is None:
+        start, stop = 0, start
+    return start + step * int(rng.integers((stop - start + step - 1) // step))
+
+
+def _monte_carlo_trial(generator, solver, seed, entrances, reducer):
+    """One trial of Maze.generate_monte_carlo_parallel, run in a worker process.
+
+    Returns:
+        tuple: score of the best solution found (-inf if no entrances could be
+            solved), seed, start cell, end cell
+    """
+    maze = Maze(seed)
+    maze.generator = generator
+    maze.solver = solver
+    maze.generate()
+
+    # for the maze, generate different entrances, and keep the best scoring solution
+    best = (float("-inf"), seed, maze.start, maze.end)
+    for _ in range(entrances):
+        maze.generate_entrances()
+        maze.solve()
+        if not maze.solutions:
+            continue
+        score = reducer(maze.solutions[0])
+        if score > best[0]:
+            best = (score, seed, maze.start, maze.end)
+    return best
+
+
 class MazeGenAlgo:
     __metaclass__ = abc.ABCMeta
 
-    def __init__(self, h, w):
+    def __init__(self, h, w, rng=None):
         """Maze Generator Algorithm constructor
 
         Attributes:
@@ -288,8 +406,11 @@ class MazeGenAlgo:
             w (int): width of maze, in number of hallways
             H (int): height of maze, in number of hallways + walls
             W (int): width of maze, in number of hallways + walls
+            rng (np.random.Generator): random stream to draw from
+                (Maze.generate replaces it with the maze's own stream)
         """
         assert w >= 3 and h >= 3, "Mazes cannot be smaller than 3x3."
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.h = h
         self.w = w
         self.H = (2 * self.h) + 1
@@ -325,7 +446,7 @@ class MazeGenAlgo:
         if c < self.W - 2 and grid[r][c + 2] == is_wall:
             ns.append((r, c + 2))
 
-        shuffle(ns)
+        self.rng.shuffle(ns)
         return ns
 
 
@@ -341,45 +462,390 @@ class Prims(MazeGenAlgo):
     4. Repeat steps 2 and 3 until V includes every cell in G.
     """
 
-    def __init__(self, h, w):
-        super(Prims, self).__init__(h, w)
+    def __init__(self, h, w, rng=None):
+        super(Prims, self).__init__(h, w, rng)
 
     def generate(self):
         """highest-level method that implements the maze-generating algorithm
 
+        The frontier lives in a preallocated array of flat grid indices: a random
+        frontier cell is popped with a swap-remove and membership is tracked in a
+        bitmap, so every step is O(1) instead of rebuilding the neighbor list.
+
         Returns:
             np.array: returned matrix
         """
-        # create empty grid
-        grid = np.empty((self.H, self.W), dtype=np.int8)
+        H, W = self.H, self.W
+        # create empty grid, and a flat writable view of it for cheap indexing
+        grid = np.empty((H, W), dtype=np.int8)
         grid.fill(1)
+        cells = memoryview(grid.reshape(-1))
+
+        frontier = [0] * (self.h * self.w)
+        in_frontier = bytearray(H * W)
+        n_frontier = 0
+        # two random draws per step: one to pick the frontier cell, one to pick its link
+        draws = self.rng.random(2 * self.h * self.w).tolist()
 
         # choose a random starting position
-        current_row = randrange(1, self.H, 2)
-        current_col = randrange(1, self.W, 2)
-        grid[current_row][current_col] = 0
-
-        # created a weighted list of all vertices connected in the graph
-        neighbors = self._find_neighbors(current_row, current_col, grid, True)
-
-        # loop over all current neighbors, until empty
-        visited = 1
-
-        while visited < self.h * self.w:
-            # find neighbor with lowest weight, make it current
-            nn = randrange(len(neighbors))
-            current_row, current_col = neighbors[nn]
-            visited += 1
-            grid[current_row][current_col] = 0
-            neighbors = neighbors[:nn] + neighbors[nn + 1 :]
-            # connect that neighbor to a random neighbor with grid[posi] == 0
-            nearest_n0, nearest_n1 = self._find_neighbors(
-                current_row, current_col, grid
-            )[0]
-            grid[(current_row + nearest_n0) // 2][(current_col + nearest_n1) // 2] = 0
-
-            # find all unvisited neighbors of current, add them to neighbors
-            unvisited = self._find_neighbors(current_row, current_col, grid, True)
-            neighbors = list(set(neighbors + unvisited))
+        current = _randrange(self.rng, 1, self.H, 2) * W + _randrange(self.rng, 1, self.W, 2)
+
+        for step in range(self.h * self.w):
+            if step:
+                # pop a random frontier cell, make it current
+                k = int(draws[2 * step] * n_frontier)
+                current = frontier[k]
+                n_frontier -= 1
+                frontier[k] = frontier[n_frontier]
+            cells[current] = 0
+            r, c = divmod(current, W)
+
+            # visited neighbors are candidates to link to, unvisited ones join the frontier
+            linked = []
+            if r > 1:
+                n = current - 2 * W
+                if not cells[n]:
+                    linked.append(-W)
+                elif not in_frontier[n]:
+                    in_frontier[n] = 1
+                    frontier[n_frontier] = n
+                    n_frontier += 1
+            if r < H - 2:
+                n = current + 2 * W
+                if not cells[n]:
+                    linked.append(W)
+                elif not in_frontier[n]:
+                    in_frontier[n] = 1
+                    frontier[n_frontier] = n
+                    n_frontier += 1
+            if c > 1:
+                n = current - 2
+                if not cells[n]:
+                    linked.append(-1)
+                elif not in_frontier[n]:
+                    in_frontier[n] = 1
+                    frontier[n_frontier] = n
+                    n_frontier += 1
+            if c < W - 2:
+                n = current + 2
+                if not cells[n]:
+                    linked.append(1)
+                elif not in_frontier[n]:
+                    in_frontier[n] = 1
+                    frontier[n_frontier] = n
+                    n_frontier += 1
+
+            # connect current to a random visited neighbor by knocking down the wall between
+            if linked:
+                cells[current + linked[int(draws[2 * step + 1] * len(linked))]] = 0
+
+        return grid
+
+
+class Kruskal(MazeGenAlgo):
+    """
+    The Algorithm
+
+    1. Create a set for every cell of the grid.
+    2. Visit every wall between two neighboring cells in a random order.
+    3. If the cells on both sides of the wall belong to different sets,
+        knock the wall down and join the two sets.
+    4. Stop once every cell belongs to the same set.
+
+    The sets are a union-find over flat cell indices, with path compression.
+    """
+
+    def __init__(self, h, w, rng=None):
+        super(Kruskal, self).__init__(h, w, rng)
+
+    def generate(self):
+        """highest-level method that implements the maze-generating algorithm
+
+        Returns:
+            np.array: returned matrix
+        """
+        h, w, W = self.h, self.w, self.W
+        grid = np.empty((self.H, self.W), dtype=np.int8)
+        grid.fill(1)
+        grid[1::2, 1::2] = 0
+        cells = memoryview(grid.reshape(-1))
+
+        # every inner wall, as (cell, neighboring cell, flat index of the wall in the grid)
+        rows, cols = np.divmod(np.arange(h * w), w)
+        right = cols < w - 1
+        down = rows < h - 1
+        first = np.concatenate((np.flatnonzero(right), np.flatnonzero(down)))
+        second = np.concatenate((first[: right.sum()] + 1, first[right.sum() :] + w))
+        wall = (2 * rows[first] + 1) * W + 2 * cols[first] + 1
+        wall += np.where(second - first == 1, 1, W)
+
+        order = self.rng.permutation(len(first))
+        first, second, wall = first[order].tolist(), second[order].tolist(), wall[order].tolist()
+
+        parent = list(range(h * w))
+        joined = 0
+        for a, b, wall_idx in zip(first, second, wall):
+            # find both roots, halving the paths on the way
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+            parent[b] = a
+            cells[wall_idx] = 0
+            joined += 1
+            if joined == h * w - 1:
+                break
+
+        return grid
+
+
+class Wilson(MazeGenAlgo):
+    """
+    The Algorithm
+
+    1. Add a random cell to the maze.
+    2. Start a random walk from a cell that is not in the maze yet,
+        remembering only the last direction taken out of every cell (loop-erasure).
+    3. Once the walk hits the maze, retrace it from its start along the remembered
+        directions and carve it into the maze.
+    4. Repeat steps 2 and 3 until every cell is in the maze.
+
+    The mazes are uniform spanning trees, unbiased by the algorithm.
+    """
+
+    def __init__(self, h, w, rng=None):
+        super(Wilson, self).__init__(h, w, rng)
+
+    def generate(self):
+        """highest-level method that implements the maze-generating algorithm
+
+        Returns:
+            np.array: returned matrix
+        """
+        h, w, W = self.h, self.w, self.W
+        grid = np.empty((self.H, self.W), dtype=np.int8)
+        grid.fill(1)
+        cells = memoryview(grid.reshape(-1))
+
+        # work in flat grid indices, where neighboring cells are 2 or 2W apart
+        steps = (-2 * W, 2 * W, -2, 2)
+        in_maze = bytearray(self.H * self.W)
+        exit_step = [0] * (self.H * self.W)
+
+        first = _randrange(self.rng, 1, self.H, 2) * W + _randrange(self.rng, 1, self.W, 2)
+        in_maze[first] = 1
+        cells[first] = 0
+
+        draws = []
+        for start in self.rng.permutation(h * w).tolist():
+            start = (2 * (start // w) + 1) * W + 2 * (start % w) + 1
+            if in_maze[start]:
+                continue
+
+            # loop-erased random walk until the maze is hit
+            current = start
+            while not in_maze[current]:
+                if not draws:
+                    draws = self.rng.integers(4, size=4 * h * w).tolist()
+                step = steps[draws.pop()]
+                r, c = divmod(current + step, W)
+                if 0 < r < self.H - 1 and 0 < c < self.W - 1:
+                    exit_step[current] = step
+                    current += step
+
+            # carve the walk into the maze
+            current = start
+            while not in_maze[current]:
+                in_maze[current] = 1
+                cells[current] = 0
+                cells[current + exit_step[current] // 2] = 0
+                current += exit_step[current]
 
         return grid
+
+
+class BacktrackingGenerator(MazeGenAlgo):
+    """
+    The Algorithm
+
+    1. Randomly choose a starting cell.
+    2. Randomly choose a wall at the current cell and open a passage through to any random,
+        adjacent cell, that has not been visited yet. This is now the current cell.
+    3. If all adjacent cells have been visited, back up to the previous and repeat step 2.
+    4. Stop when the algorithm has backed all the way up to the starting cell.
+
+    The walk is iterative, backed by an explicit, preallocated stack of flat grid indices.
+    """
+
+    def __init__(self, h, w, rng=None):
+        super(BacktrackingGenerator, self).__init__(h, w, rng)
+
+    def generate(self):
+        """highest-level method that implements the maze-generating algorithm
+
+        Returns:
+            np.array: returned matrix
+        """
+        H, W = self.H, self.W
+        grid = np.empty((H, W), dtype=np.int8)
+        grid.fill(1)
+        cells = memoryview(grid.reshape(-1))
+
+        stack = [0] * (self.h * self.w)
+        stack[0] = _randrange(self.rng, 1, H, 2) * W + _randrange(self.rng, 1, W, 2)
+        cells[stack[0]] = 0
+        top = 0
+        draws = self.rng.random(2 * self.h * self.w).tolist()
+
+        while top >= 0:
+            current = stack[top]
+            r, c = divmod(current, W)
+
+            unvisited = []
+            if r > 1 and cells[current - 2 * W]:
+                unvisited.append(-W)
+            if r < H - 2 and cells[current + 2 * W]:
+                unvisited.append(W)
+            if c > 1 and cells[current - 2]:
+                unvisited.append(-1)
+            if c < W - 2 and cells[current + 2]:
+                unvisited.append(1)
+
+            if not unvisited:
+                # dead end, back up
+                top -= 1
+                continue
+
+            step = unvisited[int(draws.pop() * len(unvisited))]
+            cells[current + step] = 0
+            cells[current + 2 * step] = 0
+            top += 1
+            stack[top] = current + 2 * step
+
+        return grid
+
+
+class Eller(MazeGenAlgo):
+    """
+    The Algorithm
+
+    1. Put every cell of the first row in its own set.
+    2. Randomly join adjacent cells of the row that belong to different sets.
+    3. For every set in the row, randomly carve at least one passage down to the next row.
+    4. Cells of the next row without a passage from above get their own, new sets.
+    5. Repeat steps 2 through 4 for every row; in the last row join all adjacent
+        cells that still belong to different sets.
+
+    Only the current row is kept in memory, so the grid is built one row at a time.
+    """
+
+    def __init__(self, h, w, xbias=0.5, ybias=0.5, rng=None):
+        """
+        Args:
+            xbias (float): probability of joining two horizontally adjacent cells
+            ybias (float): probability of carving an extra passage down
+        """
+        super(Eller, self).__init__(h, w, rng)
+        self.xbias = xbias
+        self.ybias = ybias
+
+    def generate(self):
+        """highest-level method that implements the maze-generating algorithm
+
+        Returns:
+            np.array: returned matrix
+        """
+        grid = np.empty((self.H, self.W), dtype=np.int8)
+        for r, row in enumerate(self.generate_rows()):
+            grid[r] = row
+        return grid
+
+    def generate_rows(self):
+        """Stream the grid top to bottom, one row (of cells or of walls) at a time.
+        Only the set bookkeeping of the current row is kept, so peak memory is
+        O(width), no matter the height of the maze.
+
+        Yields:
+            np.array: the next row of the grid, H rows in total
+        """
+        w, W = self.w, self.W
+        yield np.ones(W, dtype=np.int8)
+
+        sets = list(range(w))
+        next_set = w
+        for r in range(self.h):
+            last_row = r == self.h - 1
+
+            # join adjacent cells of different sets
+            row = np.ones(W, dtype=np.int8)
+            row[1::2] = 0
+            joins = self.rng.random(w - 1) < self.xbias
+            parent = {}
+            for c in range(w - 1):
+                a = sets[c]
+                while a in parent:
+                    a = parent[a]
+                b = sets[c + 1]
+                while b in parent:
+                    b = parent[b]
+                if a != b and (last_row or joins[c]):
+                    parent[b] = a
+                    row[2 * c + 2] = 0
+            for c in range(w):
+                while sets[c] in parent:
+                    sets[c] = parent[sets[c]]
+            yield row
+
+            if last_row:
+                break
+
+            # carve passages down, at least one per set
+            down = (self.rng.random(w) < self.ybias).tolist()
+            members = {}
+            for c, s in enumerate(sets):
+                members.setdefault(s, []).append(c)
+            for cols in members.values():
+                if not any(down[c] for c in cols):
+                    down[cols[_randrange(self.rng, len(cols))]] = True
+            below = np.ones(W, dtype=np.int8)
+            for c in range(w):
+                if down[c]:
+                    below[2 * c + 1] = 0
+                else:
+                    sets[c] = next_set
+                    next_set += 1
+            yield below
+
+        yield np.ones(W, dtype=np.int8)
+
+    def generate_memmap(self, filename, flush_every=256):
+        """Write the grid straight into a memory-mapped .npy file, row by row,
+        without ever holding the full grid in memory.
+
+        Args:
+            filename (str): path of the .npy file to create
+            flush_every (int): how many rows to write between flushes to disk
+        Returns:
+            np.memmap: the finished grid, opened read-only
+        """
+        grid = np.lib.format.open_memmap(filename, mode="w+", dtype=np.int8, shape=(self.H, self.W))
+        for r, row in enumerate(self.generate_rows()):
+            grid[r] = row
+            if (r + 1) % flush_every == 0:
+                grid.flush()
+        grid.flush()
+        del grid
+        return np.load(filename, mmap_mode="r")
+
+
+GENERATORS = {
+    'prims': Prims,
+    'kruskal': Kruskal,
+    'wilson': Wilson,
+    'backtracking': BacktrackingGenerator,
+    'eller': Eller,
+}
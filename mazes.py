@@ -1,14 +1,15 @@
-from dataclasses import dataclass
 from enum import Enum, auto
 from collections import deque
-import random
+import heapq
 
 import numpy as np
-import matplotlib.pyplot as plt
 
-from maze_utils import Maze, Prims
+from maze_utils import GENERATORS, Maze
+from junction_graph import JunctionGraph
+from hpa import HierarchicalPathfinder
 
 from utils.constants import *
+from utils.utils import room_rng
 
 
 COLORS = [
@@ -39,14 +40,31 @@ class TileItemType(Enum):
     INFO_HINT = auto()
 
 
+# rows of the lookup table MyMaze.to_rgb maps the tiles through:
+# walls, then the tile colors (by TC), then the items (by TileItemType), then fog
+RGB_LUT = np.array(
+    [[0., 0., 0.]] # walls are black
+    + [color.tolist() for color in COLORS]
+    + [[0., 1., 0.], # letters are green
+       [0., 0., 1.], # checkpoints are blue
+       [1., 0., 0.], # pits are red
+       [240/255, 160/255, 25/255]] # info hints are orange
+    + [[0.5, 0.5, 0.5]] # fog
+)
+RGB_LUT = np.round(RGB_LUT * 255).astype(np.uint8)
+RGB_LUT_ITEMS = 1 + len(COLORS) - 1 # + TileItemType value
+RGB_LUT_FOG = len(RGB_LUT) - 1
+
+
 class TileItem:
-    def __init__(self, tile_item_type: TileItemType) -> None:
+    def __init__(self, tile_item_type: TileItemType, payload: int) -> None:
         self.tile_item_type = tile_item_type
+        self.payload = payload # the item packed into a single int (see MyMaze.item_payloads)
 
 
 class LetterTI(TileItem):
     def __init__(self, letter: str) -> None:
-        super().__init__(tile_item_type=TileItemType.LETTER)
+        super().__init__(tile_item_type=TileItemType.LETTER, payload=ord(letter))
         self.letter = letter
     def __repr__(self) -> str:
         return f'Letter({self.letter})'
@@ -54,252 +72,474 @@ class LetterTI(TileItem):
 
 class CheckpointTI(TileItem):
     def __init__(self, code: int) -> None:
-        super().__init__(tile_item_type=TileItemType.CHECKPOINT)
+        super().__init__(tile_item_type=TileItemType.CHECKPOINT, payload=code)
         self.code = code
-    
+
     def __repr__(self) -> str:
         return f'Checkpoint({self.code})'
 
 
 class PitTI(TileItem):
     def __init__(self, index: int) -> None:
-        super().__init__(tile_item_type=TileItemType.PIT)
+        super().__init__(tile_item_type=TileItemType.PIT, payload=index)
         self.index = index
-    
+
     def __repr__(self):
         return f'Pit({self.index})'
 
 
 class InfoTI(TileItem):
     def __init__(self, key: int) -> None:
-        super().__init__(tile_item_type=TileItemType.INFO_HINT)
+        super().__init__(tile_item_type=TileItemType.INFO_HINT, payload=key)
         self.key = key
 
     def __repr__(self):
         return f'Info({self.key})'
 
 
-@dataclass
+def make_tile_item(kind: int, payload: int) -> TileItem | None:
+    '''Unpacks an item stored as (item kind, payload) in the layers of a MyMaze'''
+    if not kind:
+        return None
+    tile_item_type = TileItemType(kind)
+    payload = int(payload)
+    if tile_item_type == TileItemType.LETTER:
+        return LetterTI(chr(payload))
+    if tile_item_type == TileItemType.CHECKPOINT:
+        return CheckpointTI(payload)
+    if tile_item_type == TileItemType.PIT:
+        return PitTI(payload)
+    return InfoTI(payload)
+
+
 class Tile:
-    _type: TT
-    has: TileItem | None = None
-    color: TC = TC.BLANK
-    visible: bool = True # True if not under fog
+    '''A thin view of one tile of a MyMaze: every attribute is read from
+    (and written to) the layers of the maze on demand'''
+    __slots__ = ('_maze', 'i', 'j')
+
+    def __init__(self, maze: 'MyMaze', i: int, j: int) -> None:
+        self._maze = maze
+        self.i = i
+        self.j = j
+
+    @property
+    def _type(self) -> TT:
+        return TT(self._maze.tile_types[self.i, self.j])
+
+    @property
+    def has(self) -> TileItem | None:
+        return self._maze.item_at.get((self.i, self.j))
+
+    @has.setter
+    def has(self, set_to: TileItem | None):
+        self._maze.set_item(self.i, self.j, set_to)
+
+    @property
+    def color(self) -> TC:
+        return TC(self._maze.tile_colors[self.i, self.j])
+
+    @color.setter
+    def color(self, set_to: TC):
+        self._maze.set_color(self.i, self.j, set_to)
+
+    @property
+    def visible(self) -> bool: # True if not under fog
+        return bool(self._maze.visible[self.i, self.j])
+
+    @visible.setter
+    def visible(self, set_to: bool):
+        self._maze.visible[self.i, self.j] = set_to
+
+    def __repr__(self) -> str:
+        return f'Tile(_type={self._type}, has={self.has}, color={self.color}, visible={self.visible})'
+
+
+class FreeCells:
+    '''The passable tiles of a maze with no item on them, kept as an array of flat
+    indices (the first n are free) together with the position of every tile in it.
+    k tiles are drawn with a single Generator.choice, and taking or releasing
+    a tile is a swap in O(1)'''
+    def __init__(self, free_mask: np.ndarray) -> None:
+        self.shape = free_mask.shape
+        self.cells = np.flatnonzero(free_mask)
+        self.n = len(self.cells)
+        self.position = np.full(free_mask.size, -1, dtype=np.int64) # -1 if not free
+        self.position[self.cells] = np.arange(self.n)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def sample(self, k: int, rng: np.random.Generator) -> list[tuple[int, int]]:
+        '''k distinct free tiles, in random order (they stay free until taken)'''
+        if k > self.n:
+            raise ValueError(f'Cannot place {k} things: only {self.n} free tiles left in the maze')
+        picked = self.cells[rng.choice(self.n, size=k, replace=False)]
+        return list(zip(*(ax.tolist() for ax in np.unravel_index(picked, self.shape))))
+
+    def take(self, i: int, j: int) -> None:
+        cell = i * self.shape[1] + j
+        pos = self.position[cell]
+        if pos < 0:
+            return
+        self.n -= 1
+        last = self.cells[self.n]
+        self.cells[pos], self.cells[self.n] = last, cell
+        self.position[last] = pos
+        self.position[cell] = -1
+
+    def release(self, i: int, j: int) -> None:
+        cell = i * self.shape[1] + j
+        if self.position[cell] >= 0:
+            return
+        self.cells[self.n] = cell
+        self.position[cell] = self.n
+        self.n += 1
 
 
 class MyMaze:
-    def __init__(self, seed: int, letters: str, maze_index: int) -> None:
-        self.seed = seed * (1 + maze_index) # so that NUM_OF_MAZES are all different
+    # every generation stage draws from its own random stream, spawned from the room id
+    STAGES = ('layout', 'fog', 'colors', 'letters', 'checkpoints', 'pits', 'info_hints')
+    # the tiles are stored as a structure of arrays, one layer per attribute
+    LAYERS = ('tile_types', 'item_kinds', 'item_payloads', 'tile_colors', 'visible')
+
+    def __init__(self, seed: int, letters: str, maze_index: int, generator: str = MAZE_GENERATOR,
+                 fog_blobs: int | None = None, fog_radius: int = FOG_RADIUS) -> None:
+        self.seed = seed # the room id
         self.maze_index = maze_index
         self.letters_in_this_maze = letters
-        unique_nums = list(range(1000, 10000))
-        random.seed(seed)
-        random.shuffle(unique_nums)
+        self.checkpoint_codes_list, self.info_keys = self.room_codes(seed, maze_index)
 
-        self.checkpoint_codes_list = unique_nums[maze_index*NUM_OF_CHECKPOINTS:(maze_index+1)*NUM_OF_CHECKPOINTS]
-        self.checkpoint_codes: dict[tuple[int, int, int], int] = {}
-        unique_nums = list(range(100, 1000))
-        random.seed(seed)
-        random.shuffle(unique_nums)
-        self.info_keys = unique_nums[maze_index*NUM_OF_INFO_HINTS:(maze_index+1)*NUM_OF_INFO_HINTS]
-
-        self._maze_generated = Maze(self.seed)
-        self._maze_generated.generator = Prims(10, 15)
+        rngs = {stage: room_rng(seed, RNG_MAZE, maze_index, i) for i, stage in enumerate(self.STAGES)}
+        self._maze_generated = Maze(rngs['layout'])
+        assert generator in GENERATORS, f'Unknown maze generator: {generator}'
+        self._maze_generated.generator = GENERATORS[generator](*MAZE_SIZE)
         self._maze_generated.generate()
-        self.m_grid = 1 - self._maze_generated.grid # 1 is pass, 0 is wall
-        self.grid_shape: tuple[int, int] = self.m_grid.shape
-        self.maze: list[list[Tile]]
-        
-        self._create_maze()
-        self._add_colors()
-        self._add_pits()
-        self._add_letters()
-        self._add_checkpoints()
-        self._add_info_hints()
-        self._add_fog()
-
-    def _create_maze(self):
-        self.maze = []
-        for i in range(self.grid_shape[0]):
-            _row = []
-            for j in range(self.grid_shape[1]):
-                _row.append(Tile(TT.PASS if self.m_grid[i, j] else TT.WALL))
-            self.maze.append(_row)
-    
-    def _add_fog(self):
-        np.random.seed(self.seed+1)
-        h, w = self.grid_shape
-        N_BLOBS = 3 + (1 if np.random.random() < 0.4 else 0)
-        for _ in range(N_BLOBS):
-            epicenter = (np.random.randint(1, h-1), np.random.randint(1, w-1))
-            for dh in range(-3, 4):
-                for dw in range(-3, 4):
-                    point = epicenter[0] + dh, epicenter[1] + dw
-                    if not (0 <= point[0] < h and 0 <= point[1] < w):
-                        continue 
-                    r = np.random.random()
-                    if r < np.sqrt(1./(abs(dh) + abs(dw) + 1)):
-                        self.maze[point[0]][point[1]].visible = False
-    
-    def _get_n_unoccupied_points(self, n: int, seed: int) -> list[tuple[int, int]]:
-        np.random.seed(seed)
+        self.grid_shape: tuple[int, int] = self._maze_generated.grid.shape
+
+        self._create_layers()
+        self._add_colors(rngs['colors'])
+        self._add_pits(rngs['pits'])
+        self._add_letters(rngs['letters'])
+        self._add_checkpoints(rngs['checkpoints'])
+        self._add_info_hints(rngs['info_hints'])
+        self._add_fog(rngs['fog'], fog_blobs, fog_radius)
+        self._build_item_distances()
+
+    @staticmethod
+    def room_codes(seed: int, maze_index: int) -> tuple[list[int], list[int]]:
+        '''Checkpoint codes and info keys of a maze, known without generating it.
+        They are drawn for the whole room at once, so that they are all different'''
+        unique_nums = room_rng(seed, RNG_CODES, 0).permutation(np.arange(1000, 10000)).tolist()
+        checkpoint_codes_list = unique_nums[maze_index*NUM_OF_CHECKPOINTS:(maze_index+1)*NUM_OF_CHECKPOINTS]
+        unique_nums = room_rng(seed, RNG_CODES, 1).permutation(np.arange(100, 1000)).tolist()
+        info_keys = unique_nums[maze_index*NUM_OF_INFO_HINTS:(maze_index+1)*NUM_OF_INFO_HINTS]
+        return checkpoint_codes_list, info_keys
+
+    def _create_layers(self):
+        self.tile_types = (1 - self._maze_generated.grid).astype(np.int8) # TT: 1 is pass, 0 is wall
+        self.item_kinds = np.zeros(self.grid_shape, dtype=np.int8) # TileItemType, 0 is nothing
+        self.item_payloads = np.zeros(self.grid_shape, dtype=np.int32) # letter/code/pit index/key
+        self.tile_colors = np.zeros(self.grid_shape, dtype=np.int8) # TC
+        self.visible = np.ones(self.grid_shape, dtype=bool) # True if not under fog
+        self._create_index()
+
+    def _create_index(self):
+        '''Everything derived from the layers: the free tiles, the indices and the caches'''
+        self.free_cells = FreeCells(self.tile_types == TT.PASS.value)
+        self.item_distances: np.ndarray | None = None # see _build_item_distances
+        self._junction_graph: JunctionGraph | None = None # see junction_graph
+        self._pathfinder: HierarchicalPathfinder | None = None # see pathfinder
+        # index of the items, by kind and by coordinate, and of the color marks
+        self.items: dict[TileItemType, dict[tuple[int, int], TileItem]] = {tit: {} for tit in TileItemType}
+        self.item_at: dict[tuple[int, int], TileItem] = {}
+        self.color_marks: dict[tuple[int, int], TC] = {}
+        self.checkpoint_codes: dict[tuple[int, int, int], int] = {}
+        # empty for a freshly generated maze, filled for one loaded from its layers
+        for i, j in zip(*(ax.tolist() for ax in np.nonzero(self.item_kinds))):
+            item = make_tile_item(self.item_kinds[i, j], self.item_payloads[i, j])
+            self.item_at[(i, j)] = item
+            self.items[item.tile_item_type][(i, j)] = item
+            self.free_cells.take(i, j)
+            if item.tile_item_type == TileItemType.CHECKPOINT:
+                self.checkpoint_codes[(self.maze_index, i, j)] = item.code
+        for i, j in zip(*(ax.tolist() for ax in np.nonzero(self.tile_colors))):
+            self.color_marks[(i, j)] = TC(int(self.tile_colors[i, j]))
+
+    @classmethod
+    def from_layers(cls, seed: int, letters: str, maze_index: int, checkpoint_codes_list: list[int],
+                    info_keys: list[int], layers: dict[str, np.ndarray],
+                    item_distances: tuple[np.ndarray, np.ndarray] | None = None) -> 'MyMaze':
+        '''A maze rebuilt around existing layers (see LAYERS), e.g. memory-mapped from a save file;
+        nothing is generated again and the arrays are used as they are, not copied.
+        item_distances: its item_distances and item_sources, if already built (see _build_item_distances)'''
+        maze = cls.__new__(cls)
+        maze.seed = seed
+        maze.maze_index = maze_index
+        maze.letters_in_this_maze = letters
+        maze.checkpoint_codes_list = list(checkpoint_codes_list)
+        maze.info_keys = list(info_keys)
+        for name in cls.LAYERS:
+            setattr(maze, name, layers[name])
+        maze.grid_shape = maze.tile_types.shape
+        maze._create_index()
+        if item_distances is None:
+            maze._build_item_distances()
+        else:
+            maze.item_distances, maze.item_sources = item_distances
+        return maze
+
+    def same_layout(self, other: 'MyMaze') -> bool:
+        '''Same layers and codes, e.g. after a save/load round-trip'''
+        return (self.seed == other.seed and self.maze_index == other.maze_index
+                and self.letters_in_this_maze == other.letters_in_this_maze
+                and self.checkpoint_codes_list == other.checkpoint_codes_list
+                and self.info_keys == other.info_keys
+                and self.checkpoint_codes == other.checkpoint_codes
+                and all(np.array_equal(getattr(self, name), getattr(other, name)) for name in self.LAYERS))
+
+    def tile(self, i: int, j: int) -> Tile:
+        return Tile(self, i, j)
+
+    def set_item(self, i: int, j: int, item: TileItem | None):
+        had_item = bool(self.item_kinds[i, j])
+        if had_item:
+            old_item = self.item_at.pop((i, j))
+            del self.items[old_item.tile_item_type][(i, j)]
+        if item is not None:
+            self.item_at[(i, j)] = item
+            self.items[item.tile_item_type][(i, j)] = item
+        if item is None:
+            self.item_kinds[i, j] = 0
+            self.item_payloads[i, j] = 0
+            if self.tile_types[i, j] == TT.PASS.value:
+                self.free_cells.release(i, j)
+        else:
+            self.item_kinds[i, j] = item.tile_item_type.value
+            self.item_payloads[i, j] = item.payload
+            self.free_cells.take(i, j)
+        if self.item_distances is not None and had_item != (item is not None):
+            if had_item:
+                self._repair_item_distances_removed(i * self.grid_shape[1] + j)
+            else:
+                self._repair_item_distances_added(i * self.grid_shape[1] + j)
+        # a removed item may stay a node of the graph, but a new one has to become one
+        if (self._junction_graph is not None and item is not None
+                and not self._junction_graph.is_key[i * self.grid_shape[1] + j]):
+            self._junction_graph = None
+        if self._pathfinder is not None:
+            self._pathfinder.set_target(i, j, item is not None)
+
+    def set_color(self, i: int, j: int, color: TC):
+        self.tile_colors[i, j] = color.value
+        if color == TC.BLANK:
+            self.color_marks.pop((i, j), None)
+        else:
+            self.color_marks[(i, j)] = color
+
+    def find_pit(self, leading_to: int) -> tuple[int, int] | None:
+        '''Coordinates of the pit of this maze that leads to the maze with the given index'''
+        for coords, pit in self.items[TileItemType.PIT].items():
+            if pit.index == leading_to:
+                return coords
+        return None
+
+    def find_checkpoint(self, code: int) -> tuple[int, int] | None:
+        for coords, checkpoint in self.items[TileItemType.CHECKPOINT].items():
+            if checkpoint.code == code:
+                return coords
+        return None
+
+    def _build_item_distances(self):
+        '''Multi-source BFS seeded from every item tile at once: for every tile, the
+        distance to the closest item and the flat index of that item (-1 if none is
+        reachable). Every step expands the whole wavefront with numpy'''
+        passable = (self.tile_types == TT.PASS.value).ravel()
+        dist = np.full(passable.size, -1, dtype=np.int32)
+        source = np.full(passable.size, -1, dtype=np.int64)
+        frontier = np.flatnonzero(self.item_kinds)
+        dist[frontier] = 0
+        source[frontier] = frontier
+        # passable tiles are never on the border, so their neighbors are always in the grid
+        offsets = np.array([-self.grid_shape[1], self.grid_shape[1], -1, 1])
+        d = 0
+        while frontier.size:
+            d += 1
+            ns = (frontier[:, None] + offsets).ravel()
+            labels = np.repeat(source[frontier], len(offsets))
+            new = passable[ns] & (dist[ns] < 0)
+            ns, first = np.unique(ns[new], return_index=True)
+            dist[ns] = d
+            source[ns] = labels[new][first]
+            frontier = ns
+        self.item_distances = dist.reshape(self.grid_shape)
+        self.item_sources = source.reshape(self.grid_shape)
+
+    def _neighbors(self, cell: int) -> tuple[int, int, int, int]:
+        w = self.grid_shape[1]
+        return cell - w, cell + w, cell - 1, cell + 1
+
+    def _repair_item_distances_removed(self, removed: int):
+        '''Only the tiles whose closest item was the removed one can get further away.
+        They form a connected region around it (the BFS tree of that item): clear it,
+        and refill it from its boundary, closest first'''
+        dist, source = self.item_distances.ravel(), self.item_sources.ravel()
+        region = [removed]
+        source[removed] = -1
+        for cell in region:
+            for n in self._neighbors(cell):
+                if source[n] == removed:
+                    source[n] = -1
+                    region.append(n)
+        dist[region] = -1
+
+        passable = self.tile_types.ravel()
+        queue = []
+        for cell in region:
+            for n in self._neighbors(cell):
+                if dist[n] >= 0:
+                    queue.append((int(dist[n]) + 1, cell, int(source[n])))
+        heapq.heapify(queue)
+        while queue:
+            d, cell, label = heapq.heappop(queue)
+            if dist[cell] >= 0:
+                continue
+            dist[cell] = d
+            source[cell] = label
+            for n in self._neighbors(cell):
+                if passable[n] and dist[n] < 0:
+                    heapq.heappush(queue, (d + 1, n, label))
+
+    def _repair_item_distances_added(self, added: int):
+        '''A new item only brings tiles closer: spread out from it while it improves on the field'''
+        dist, source = self.item_distances.ravel(), self.item_sources.ravel()
+        passable = self.tile_types.ravel()
+        dist[added] = 0
+        source[added] = added
+        queue = deque([added])
+        while queue:
+            cell = queue.popleft()
+            d = dist[cell] + 1
+            for n in self._neighbors(cell):
+                if passable[n] and (dist[n] < 0 or dist[n] > d):
+                    dist[n] = d
+                    source[n] = added
+                    queue.append(n)
+
+    def closest_item_distance(self, i: int, j: int) -> int:
+        '''Number of moves from the tile to the closest something
+        (checkpoint, pit, letter or info hint); -1 if there is nothing left in this maze'''
+        return int(self.item_distances[i, j])
+
+    def _add_fog(self, rng: np.random.Generator, n_blobs: int | None = None, radius: int = FOG_RADIUS):
+        '''Every blob hides a tile at (dh, dw) from its epicenter with probability
+        sqrt(1/(|dh| + |dw| + 1)). The chances of every tile to stay clear of all the
+        blobs are built as a whole array, then compared against one batched uniform draw'''
         h, w = self.grid_shape
-        points = []
-        while len(points) < n:
-            pt = (np.random.randint(1, h-1), np.random.randint(1, w-1))
-            if self.maze[pt[0]][pt[1]]._type == TT.PASS and self.maze[pt[0]][pt[1]].has is None:
-                points.append(pt)
-        return points
-
-    def _add_colors(self):
-        np.random.seed(self.seed+2)
-        points = self._get_n_unoccupied_points(NUM_OF_MARKS, self.seed+2)
+        if n_blobs is None:
+            n_blobs = 3 + (1 if rng.random() < 0.4 else 0)
+        epicenters_i = rng.integers(1, h-1, size=n_blobs)
+        epicenters_j = rng.integers(1, w-1, size=n_blobs)
+
+        d = np.arange(-radius, radius+1)
+        clear_kernel = 1. - np.sqrt(1./(np.abs(d)[:, None] + np.abs(d)[None, :] + 1))
+        # padded by the radius, so that blobs near the border need no clipping
+        clear = np.ones((h + 2*radius, w + 2*radius))
+        np.multiply.at(
+            clear,
+            (epicenters_i[:, None, None] + radius + d[None, :, None], epicenters_j[:, None, None] + radius + d[None, None, :]),
+            np.broadcast_to(clear_kernel, (n_blobs, *clear_kernel.shape))
+        )
+        self.visible &= rng.random(self.grid_shape) < clear[radius:radius+h, radius:radius+w]
+
+    def _add_colors(self, rng: np.random.Generator):
+        points = self.free_cells.sample(NUM_OF_MARKS, rng)
         COLOR_MAP = [TC.CYAN, TC.MAGENTA, TC.YELLOW]
         for p in points:
-            self.maze[p[0]][p[1]].color = COLOR_MAP[np.random.randint(3)]
-    
-    def _add_letters(self):
-        points = self._get_n_unoccupied_points(len(self.letters_in_this_maze), self.seed+3)
+            self.set_color(*p, COLOR_MAP[rng.integers(3)])
+
+    def _add_letters(self, rng: np.random.Generator):
+        points = self.free_cells.sample(len(self.letters_in_this_maze), rng)
         for letter, p in zip(self.letters_in_this_maze, points):
-            self.maze[p[0]][p[1]].has = LetterTI(letter=letter)
+            self.set_item(*p, LetterTI(letter=letter))
 
-    def _add_checkpoints(self):
-        points = self._get_n_unoccupied_points(NUM_OF_CHECKPOINTS, self.seed+4)
+    def _add_checkpoints(self, rng: np.random.Generator):
+        points = self.free_cells.sample(NUM_OF_CHECKPOINTS, rng)
         for cp_code, p in zip(self.checkpoint_codes_list, points):
-            self.maze[p[0]][p[1]].has = CheckpointTI(code=cp_code)
+            self.set_item(*p, CheckpointTI(code=cp_code))
             self.checkpoint_codes[(self.maze_index, p[0], p[1])] = cp_code
-    
-    def _add_pits(self):
-        points = self._get_n_unoccupied_points(NUM_OF_PITS, self.seed+5)
+
+    def _add_pits(self, rng: np.random.Generator):
+        points = self.free_cells.sample(NUM_OF_PITS, rng)
         points_iter = iter(points)
         for pit_idx in range(NUM_OF_MAZES):
             if pit_idx != self.maze_index:
                 p = next(points_iter)
-                self.maze[p[0]][p[1]].has = PitTI(index=pit_idx)
-    
-    def _add_info_hints(self):
-        points = self._get_n_unoccupied_points(NUM_OF_INFO_HINTS, self.seed+6)
+                self.set_item(*p, PitTI(index=pit_idx))
+
+    def _add_info_hints(self, rng: np.random.Generator):
+        points = self.free_cells.sample(NUM_OF_INFO_HINTS, rng)
         for info_key, point in zip(self.info_keys, points):
-            self.maze[point[0]][point[1]].has = InfoTI(info_key)
-    
+            self.set_item(*point, InfoTI(info_key))
+
     def __str__(self) -> str:
-        res = ''
-        for i in range(self.grid_shape[0]):
-            for j in range(self.grid_shape[1]):
-                if not self.maze[i][j].visible:
-                    res += '?'
-                    continue
-                if self.maze[i][j]._type == TT.WALL:
-                    res += '#'
-                    continue
-                if self.maze[i][j].has is None:
-                    res += '.'
-                    continue
-                if self.maze[i][j].has.tile_item_type == TileItemType.PIT:
-                    res += '!'
-                    continue
-                if self.maze[i][j].has.tile_item_type == TileItemType.CHECKPOINT:
-                    res += '*'
-                    continue
-                if self.maze[i][j].has.tile_item_type == TileItemType.LETTER:
-                    res += self.maze[i][j].has.letter
-                    continue
-            res += '\n'
-        return res
+        chars = np.where(self.tile_types == TT.PASS.value, '.', '#').astype(object)
+        chars[self.item_kinds == TileItemType.PIT.value] = '!'
+        chars[self.item_kinds == TileItemType.CHECKPOINT.value] = '*'
+        chars[self.item_kinds == TileItemType.INFO_HINT.value] = '@'
+        letters = self.item_kinds == TileItemType.LETTER.value
+        chars[letters] = [chr(p) for p in self.item_payloads[letters]]
+        chars[~self.visible] = '?'
+        return ''.join(''.join(row) + '\n' for row in chars)
 
     def get_all_color_marks(self) -> list[tuple[tuple[int, int], TC]]:
-        to_ret = []
-        for i in range(self.grid_shape[0]):
-            for j in range(self.grid_shape[1]):
-                if self.maze[i][j].color != TC.BLANK:
-                    to_ret.append(((i, j), self.maze[i][j].color))
-        return to_ret
-
-    def get_all_things(self) -> list[tuple[tuple[int, int], TileItem]]:
-        to_ret = []
-        for i in range(self.grid_shape[0]):
-            for j in range(self.grid_shape[1]):
-                if self.maze[i][j].has is not None:
-                    to_ret.append(((i, j), self.maze[i][j].has))
-        return to_ret
+        return sorted(self.color_marks.items())
+
+    def get_all_things(self, kind: TileItemType | None = None) -> list[tuple[tuple[int, int], TileItem]]:
+        '''All the items (of the given kind), ordered by coordinates'''
+        return sorted((self.item_at if kind is None else self.items[kind]).items())
 
     def get_all_empty_passes(self) -> list[tuple[int, int]]:
-        to_ret = []
-        for i in range(self.grid_shape[0]):
-            for j in range(self.grid_shape[1]):
-                if self.maze[i][j]._type == TT.PASS:
-                    to_ret.append((i, j))
-        return to_ret
-    
-    def bfs(self, start_pos: tuple[int, int]) -> ...:
-        '''Returns a list of coordinates: tiles to the 
+        ii, jj = np.nonzero(self.tile_types == TT.PASS.value)
+        return list(zip(ii.tolist(), jj.tolist()))
+
+    @property
+    def junction_graph(self) -> JunctionGraph:
+        '''The maze contracted to its junctions, dead ends and item tiles (built on first use)'''
+        if self._junction_graph is None:
+            self._junction_graph = JunctionGraph(self.tile_types == TT.PASS.value, self.item_kinds != 0)
+        return self._junction_graph
+
+    @property
+    def pathfinder(self) -> HierarchicalPathfinder:
+        '''Hierarchical pathfinder over the maze, looking for the items (built on first use);
+        meant for mazes much larger than the junction graph handles comfortably'''
+        if self._pathfinder is None:
+            self._pathfinder = HierarchicalPathfinder(self.tile_types == TT.PASS.value, self.item_kinds != 0, HPA_CLUSTER_SIZE)
+        return self._pathfinder
+
+    def shortest_path(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> list[tuple[int, int]]:
+        '''Tiles from start to end, both included; [] if the end cannot be reached'''
+        return self.junction_graph.shortest_path(start_pos, end_pos)
+
+    def distance(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> int:
+        '''Number of steps from start to end; -1 if the end cannot be reached'''
+        return self.junction_graph.distance(start_pos, end_pos)
+
+    def bfs(self, start_pos: tuple[int, int]) -> list[tuple[int, int]]:
+        '''Returns a list of coordinates: tiles to the
         closest something (checkpoint, pit or a letter)
         If [], there is nothing left in this maze'''
+        return self.junction_graph.nearest(start_pos, lambda tile: self.item_kinds[tile] != 0)
 
-        visited = {start_pos}
-        queue = deque([start_pos])
-        found = False
-
-        backtrack = {start_pos: None}
-
-        while queue and not found:
-            c = queue.popleft() # current position
-            if self.maze[c[0]][c[1]].has is not None:
-                found = True
-                break
-            n = (c[0]+1, c[1]) # neighbor
-            if n not in visited and self.maze[n[0]][n[1]]._type == TT.PASS:
-                queue.append(n)
-                visited.add(n)
-                backtrack[n] = c
-            n = (c[0]-1, c[1]) # neighbor
-            if n not in visited and self.maze[n[0]][n[1]]._type == TT.PASS:
-                queue.append(n)
-                visited.add(n)
-                backtrack[n] = c
-            n = (c[0], c[1]+1) # neighbor
-            if n not in visited and self.maze[n[0]][n[1]]._type == TT.PASS:
-                queue.append(n)
-                visited.add(n)
-                backtrack[n] = c
-            n = (c[0], c[1]-1) # neighbor
-            if n not in visited and self.maze[n[0]][n[1]]._type == TT.PASS:
-                queue.append(n)
-                visited.add(n)
-                backtrack[n] = c
-        sol = []
-        if found:
-            while c is not None:
-                sol.append(c)
-                c = backtrack[c]
-            return sol[::-1]
-        else: return []
+    def to_rgb(self, fog: bool = True) -> np.ndarray:
+        '''The maze as an (h, w, 3) uint8 image: every tile picks its row of RGB_LUT'''
+        lut_rows = np.where(self.item_kinds != 0, RGB_LUT_ITEMS + self.item_kinds,
+                            (self.tile_types == TT.PASS.value) * (1 + self.tile_colors))
+        if fog:
+            lut_rows[~self.visible] = RGB_LUT_FOG
+        return RGB_LUT[lut_rows]
 
     def plot_mpl(self, fog: bool = True):
-        maze_img = np.zeros((*self.grid_shape, 3), dtype=float)
-        for i in range(self.grid_shape[0]):
-            for j in range(self.grid_shape[1]):
-                if fog and not self.maze[i][j].visible:
-                    maze_img[i, j, :] = 0.5
-                    continue
-                if self.maze[i][j]._type == TT.WALL:
-                    maze_img[i, j, :] = 0.
-                    continue
-                # this is PASS:
-                maze_img[i, j, :] = COLORS[self.maze[i][j].color.value]
-                if self.maze[i][j].has is None:
-                    continue
-                if self.maze[i][j].has.tile_item_type == TileItemType.PIT:
-                    maze_img[i, j, :] = np.array([1., 0., 0.]) # red
-                    continue
-                if self.maze[i][j].has.tile_item_type == TileItemType.CHECKPOINT:
-                    maze_img[i, j, :] = np.array([0., 0., 1.]) # blue
-                    continue
-                if self.maze[i][j].has.tile_item_type == TileItemType.LETTER:
-                    maze_img[i, j, :] = np.array([0., 1., 0.]) # green
-                    continue
-                if self.maze[i][j].has.tile_item_type == TileItemType.INFO_HINT:
-                    maze_img[i, j, :] = np.array([240., 160., 25.])/255. # orange
-                    continue
-        plt.imshow(maze_img)
+        import matplotlib.pyplot as plt # only needed here (and it is slow to import)
+        plt.imshow(self.to_rgb(fog))
         plt.show()
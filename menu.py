@@ -1,10 +1,11 @@
-import random
-
 import pygame
 
+from gui.compositor import get_compositor
+from gui.frame_scheduler import FrameScheduler
 from gui.gui_utils import *
 from gui.gui_rect import Button, Panel, TextEntry
-from game import Game
+from room_cache import RoomCache
+from room_pool import RoomPool
 from game_gui_p1 import GameGUI1
 from game_gui_p2 import GameGUI2
 
@@ -12,8 +13,11 @@ class MazeApp:
     def __init__(self) -> None:
         pygame.init()
         self.surface = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.clock = pygame.time.Clock()
+        self.frame_scheduler = FrameScheduler()
+        self.compositor = get_compositor(self.surface)
         self.is_running = True
+        self.room_cache = RoomCache()
+        self.room_pool = RoomPool(self.room_cache)
 
         self._create_buttons()
         self._create_create_room_panel()
@@ -78,6 +82,9 @@ class MazeApp:
         self.quit_btn.update(pos)
 
         self.create_room_panel.update(pos)
+        self.create_room_panel.gui_objects['rnd_btn'].hint_label.set_text(
+            f'insert a random code ({self.room_pool.fill_level}/{self.room_pool.size} ready)'
+        )
         self.create_room_panel.gui_objects['start_btn'].hint_label.set_text(
             f'enter the game with {text_entry_text} as the 1st player'\
             if (text_entry_text:=self.create_room_panel.gui_objects["text_entry"].get_text()) else 'empty field!'
@@ -112,15 +119,16 @@ class MazeApp:
         Infinite game loop
         '''
         while self.is_running:
-            self.clock.tick(FRAMERATE)
-            self.surface.fill(BLACK)
+            events = self.frame_scheduler.next_frame()
+            self.compositor.begin_frame()
             pos = pygame.mouse.get_pos()
+            self.room_pool.fill() # the menu is idle: get some random rooms ready
 
             # update gui
             self.update_gui(pos)
 
             # process events
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.KEYDOWN:
                     #* such a mess omg...
                     if any(te.focused for te in self.menu_text_entries):
@@ -137,6 +145,8 @@ class MazeApp:
                                         self.join_start_btn_pressed()
                     if event.key == pygame.K_ESCAPE:
                         for te in self.menu_text_entries: te.focused = False
+                    elif event.key == pygame.K_F3:
+                        self.compositor.toggle_debug()
                 elif event.type == pygame.MOUSEBUTTONUP:
                     if event.button != 1: continue
                     if self.quit_btn.clicked():
@@ -160,7 +170,8 @@ class MazeApp:
                         elif obj_clicked == 'rnd_btn':
                             self.create_room_panel \
                                     .gui_objects['text_entry'] \
-                                    .text_label.set_text(str(random.randint(100000, 999999)))
+                                    .text_label.set_text(str(self.room_pool.take()))
+                            print('room pool:', self.room_pool.fill_level, 'ready, build time', self.room_pool.latency)
                         elif obj_clicked == 'start_btn':
                             self.create_start_btn_pressed()
                     elif self.join_room_panel.clicked():
@@ -169,14 +180,22 @@ class MazeApp:
                             self.join_room_panel.gui_objects['text_entry'].toggle_focused()
                         elif obj_clicked == 'start_btn':
                             self.join_start_btn_pressed()
-            pygame.display.update()
+            self.compositor.end_frame()
+        self.room_pool.shutdown()
     
     def start_game_loop(self, room_id: int, is_second_player: bool):
-        self.game = Game(room_id, is_second_player)
-        print(room_id, self.game.word_to_win, self.game.exit_position)
+        # the second player only ever stands in one maze: the others can wait
+        self.game = self.room_cache.get(room_id, is_second_player, lazy=is_second_player)
+        if room_id not in self.room_cache: # generated lazily: cached from scratch in the background
+            self.room_pool.cache_room(room_id)
+        print(room_id, self.game.word_to_win, self.game.exit_maze_index)
+        print('room cache:', self.room_cache.stats)
         if is_second_player:
             self.game_gui = GameGUI2(self.game, self.surface)
         else:
             self.game_gui = GameGUI1(self.game, self.surface)
         
         self.game_gui.run()
+        self.game.close()
+        self.compositor.invalidate() # back to the menu
+        self.frame_scheduler.wake()
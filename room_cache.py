@@ -0,0 +1,101 @@
+'''
+A local cache of generated games, so that joining a room again loads it from disk.
+
+Every room is one file written by Game.save, named after the room id, the
+maze size and generator and GENERATOR_VERSION (bumped whenever the same room id
+starts generating another game for any other reason), so that rooms generated
+with other settings are never loaded. The least recently used files are evicted once the directory grows over
+its size limit; a file's modification time is its last use.
+'''
+import os
+from pathlib import Path
+import zipfile
+
+from game import Game
+from utils.constants import GENERATOR_VERSION, MAZE_GENERATOR, MAZE_SIZE, ROOM_CACHE_DIR, ROOM_CACHE_MAX_BYTES
+
+
+class RoomCache:
+    def __init__(self, directory: str | Path = ROOM_CACHE_DIR, max_bytes: int = ROOM_CACHE_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, room_id: int) -> Path:
+        rows, cols = MAZE_SIZE
+        return self.directory / f'room_{room_id}_{MAZE_GENERATOR}_{rows}x{cols}_v{GENERATOR_VERSION}.npz'
+
+    def __contains__(self, room_id: int) -> bool:
+        return self.path(room_id).exists()
+
+    def get(self, room_id: int, is_second_player: bool, lazy: bool = False) -> Game:
+        '''The game of the room: loaded if it is cached, generated (and cached) otherwise.
+        lazy: generate a missing game lazily (see Game); it is not cached then,
+            as caching it would mean building all its mazes right away (see RoomPool.cache_room)'''
+        path = self.path(room_id)
+        if path.exists():
+            try:
+                game = Game.load(path, is_second_player)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e: # unreadable, or another save format
+                print(f'room cache: dropping {path.name} ({e})')
+            else:
+                self.hits += 1
+                os.utime(path) # most recently used
+                return game
+        self.misses += 1
+        game = Game(room_id, is_second_player, lazy=lazy)
+        if not lazy:
+            self.put(game)
+        return game
+
+    def put(self, game: Game):
+        '''Caches a freshly generated game (best effort: the game works without it)'''
+        path = self.path(game.seed)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            game.save(tmp_path)
+            os.replace(tmp_path, path) # never leave half-written files behind
+        except OSError as e:
+            print(f'room cache: could not write {path.name} ({e})')
+            tmp_path.unlink(missing_ok=True)
+            return
+        self.evict(keep=path)
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob('room_*.npz'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self, keep: Path | None = None):
+        '''Removes the least recently used rooms until the cache fits in max_bytes'''
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError: # e.g. still mapped by a running game on Windows
+                continue
+            total -= size
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.,
+            'rooms': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+        }
@@ -0,0 +1,106 @@
+'''
+Ready-made games for random room codes.
+
+While the menu idles, worker processes generate games for random room ids and
+write them to the room cache; taking a room from the pool then only has to
+load it from there. The same workers also cache the rooms that were played
+without being cached (the lazily generated games of the second player).
+'''
+from concurrent.futures import Future, ProcessPoolExecutor
+import contextlib
+import io
+import random
+import time
+
+from game import Game
+from room_cache import RoomCache
+from utils.constants import ROOM_POOL_SIZE, ROOM_POOL_WORKERS
+
+
+def _generate_room(room_id: int, cache_directory: str, cache_max_bytes: int) -> float:
+    '''Generates a game into the cache (in a worker process); returns how long it took'''
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()): # Game prints the solution
+        game = Game(room_id, is_second_player=False)
+    RoomCache(cache_directory, cache_max_bytes).put(game)
+    return time.perf_counter() - start
+
+
+class RoomPool:
+    def __init__(self, cache: RoomCache, size: int = ROOM_POOL_SIZE, max_workers: int = ROOM_POOL_WORKERS) -> None:
+        self.cache = cache
+        self.size = size
+        self._executor = ProcessPoolExecutor(max_workers) # the processes start with the first job
+        self._pending: dict[int, Future] = {}
+        self._ready: list[int] = []
+        self._caching: dict[int, Future] = {} # see cache_room
+        self.build_times: list[float] = [] # in seconds, of every game built so far
+
+    def _collect(self):
+        for futures, ready in ((self._pending, self._ready), (self._caching, None)):
+            for room_id, future in list(futures.items()):
+                if not future.done():
+                    continue
+                del futures[room_id]
+                try:
+                    self.build_times.append(future.result())
+                except Exception as e: # the room can still be generated when it is played
+                    print(f'room pool: could not generate room {room_id} ({e!r})')
+                else:
+                    if ready is not None:
+                        ready.append(room_id)
+
+    def fill(self):
+        '''Collects the finished games and starts new ones until the pool is full; never blocks,
+        so it can be called every frame'''
+        self._collect()
+        while len(self._ready) + len(self._pending) < self.size:
+            room_id = random.randint(100000, 999999)
+            if room_id in self._pending or room_id in self._ready or room_id in self._caching or room_id in self.cache:
+                continue
+            self._pending[room_id] = self._executor.submit(
+                _generate_room, room_id, str(self.cache.directory), self.cache.max_bytes)
+
+    def cache_room(self, room_id: int):
+        '''Generates the game of a room into the cache in a worker process, from scratch so that
+        it is cached as it was before being played; it is not handed out by take'''
+        self._collect()
+        if room_id in self._pending or room_id in self._caching or room_id in self.cache:
+            return
+        self._caching[room_id] = self._executor.submit(
+            _generate_room, room_id, str(self.cache.directory), self.cache.max_bytes)
+
+    def take(self) -> int:
+        '''A random room id, whose game is already cached if the pool is not empty'''
+        self._collect()
+        while self._ready:
+            room_id = self._ready.pop(0)
+            if room_id in self.cache: # it may have been evicted since
+                self.fill()
+                return room_id
+        self.fill()
+        return random.randint(100000, 999999)
+
+    @property
+    def fill_level(self) -> int:
+        '''Number of games ready to be taken'''
+        self._collect()
+        return len(self._ready)
+
+    @property
+    def latency(self) -> dict[str, float]:
+        '''Build time of the games, in seconds'''
+        if not self.build_times:
+            return {'last': 0., 'mean': 0., 'max': 0.}
+        return {
+            'last': self.build_times[-1],
+            'mean': sum(self.build_times) / len(self.build_times),
+            'max': max(self.build_times),
+        }
+
+    def shutdown(self):
+        '''Drops the queued random games; waits for the ones being built and for the rooms
+        being cached (a game takes a fraction of a second)'''
+        for future in self._pending.values():
+            future.cancel()
+        self._executor.shutdown()
@@ -0,0 +1,153 @@
+'''
+Shortest routes across all the mazes of a game.
+
+Every position (maze, i, j) on a passable tile is a node. Moving to a neighboring
+tile costs 1; falling into a pit (to the paired pit of the other maze) and teleporting
+between checkpoints are jumps that cost 0. Queries run a 0-1 BFS over two compact
+CSR adjacencies (moves and jumps), one whole wavefront at a time.
+'''
+from collections import OrderedDict
+
+import numpy as np
+
+from mazes import TT, TileItemType
+
+
+def _build_csr(n_nodes: int, sources: np.ndarray, targets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(sources, kind='stable')
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n_nodes), out=indptr[1:])
+    return indptr, targets[order]
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    '''All the edges going out of the frontier, as (targets, sources)'''
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    ends = np.cumsum(counts)
+    edge_ids = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts - starts, counts)
+    return indices[edge_ids], np.repeat(frontier, counts)
+
+
+class RouteEngine:
+    def __init__(self, game, checkpoint_teleports: bool = True, cache_size: int = 64) -> None:
+        '''
+        checkpoint_teleports: whether checkpoints count as linked to each other
+            (in the game they are, once both of them are registered)
+        cache_size: how many single-source searches to keep
+        '''
+        self.n_mazes = len(game.mazes)
+        self.grid_shape: tuple[int, int] = game.grid_shape
+        h, w = self.grid_shape
+        self.n_nodes = self.n_mazes * h * w
+
+        passable = np.stack([maze.tile_types == TT.PASS.value for maze in game.mazes]).ravel()
+        # passable tiles are never on the border, so moves never leave their maze
+        nodes = np.flatnonzero(passable)
+        move_sources, move_targets = [], []
+        for offset in (-w, w, -1, 1):
+            neighbors = nodes + offset
+            ok = passable[neighbors]
+            move_sources.append(nodes[ok])
+            move_targets.append(neighbors[ok])
+        self.moves = _build_csr(self.n_nodes, np.concatenate(move_sources), np.concatenate(move_targets))
+
+        jump_sources, jump_targets = [], []
+        for maze_idx, maze in enumerate(game.mazes):
+            for coords, pit in maze.get_all_things(TileItemType.PIT):
+                jump_sources.append(self.node((maze_idx, *coords)))
+                jump_targets.append(self.node((pit.index, *game.mazes[pit.index].find_pit(leading_to=maze_idx))))
+        if checkpoint_teleports:
+            checkpoints = [self.node(pos) for pos in game.checkpoint_codes]
+            for a in checkpoints:
+                for b in checkpoints:
+                    if a != b:
+                        jump_sources.append(a)
+                        jump_targets.append(b)
+        self.jumps = _build_csr(self.n_nodes, np.array(jump_sources, dtype=np.int64), np.array(jump_targets, dtype=np.int64))
+
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, tuple[np.ndarray, np.ndarray]] = OrderedDict()
+
+    def node(self, position: tuple[int, int, int]) -> int:
+        maze_idx, i, j = position
+        return (maze_idx * self.grid_shape[0] + i) * self.grid_shape[1] + j
+
+    def position(self, node: int) -> tuple[int, int, int]:
+        rest, j = divmod(int(node), self.grid_shape[1])
+        maze_idx, i = divmod(rest, self.grid_shape[0])
+        return maze_idx, i, j
+
+    def _search(self, source: int) -> tuple[np.ndarray, np.ndarray]:
+        '''0-1 BFS from a node: distances (-1 if unreachable) and parents of every node'''
+        if source in self._cache:
+            self._cache.move_to_end(source)
+            return self._cache[source]
+
+        dist = np.full(self.n_nodes, -1, dtype=np.int32)
+        parent = np.full(self.n_nodes, -1, dtype=np.int64)
+        dist[source] = 0
+        parent[source] = source
+        level = self._close_over_jumps(np.array([source]), dist, parent, 0)
+        d = 0
+        while level.size:
+            d += 1
+            targets, sources = _gather(*self.moves, level)
+            new = dist[targets] < 0
+            targets, first = np.unique(targets[new], return_index=True)
+            dist[targets] = d
+            parent[targets] = sources[new][first]
+            level = self._close_over_jumps(targets, dist, parent, d)
+
+        self._cache[source] = (dist, parent)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return dist, parent
+
+    def _close_over_jumps(self, level: np.ndarray, dist: np.ndarray, parent: np.ndarray, d: int) -> np.ndarray:
+        '''Adds to a wavefront everything reachable from it by free jumps'''
+        added = level
+        while added.size:
+            targets, sources = _gather(*self.jumps, added)
+            new = dist[targets] < 0
+            added, first = np.unique(targets[new], return_index=True)
+            dist[added] = d
+            parent[added] = sources[new][first]
+            level = np.concatenate((level, added))
+        return level
+
+    def distances_from(self, start: tuple[int, int, int]) -> np.ndarray:
+        '''Distances from the position to every (maze, i, j); -1 where unreachable'''
+        return self._search(self.node(start))[0].reshape(self.n_mazes, *self.grid_shape)
+
+    def distance(self, start: tuple[int, int, int], end: tuple[int, int, int]) -> int:
+        return int(self._search(self.node(start))[0][self.node(end)])
+
+    def shortest_path(self, start: tuple[int, int, int], end: tuple[int, int, int]) -> list[tuple[int, int, int]]:
+        '''Positions from start to end, both included; consecutive positions in
+        different mazes (or far apart) are jumps. [] if the end is unreachable'''
+        source = self.node(start)
+        _, parent = self._search(source)
+        node = self.node(end)
+        if parent[node] < 0:
+            return []
+        path = [node]
+        while node != source:
+            node = int(parent[node])
+            path.append(node)
+        return [self.position(n) for n in reversed(path)]
+
+    def distance_matrix(self, positions: list[tuple[int, int, int]]) -> np.ndarray:
+        '''Pairwise distances between the positions (one search per position)'''
+        nodes = [self.node(pos) for pos in positions]
+        return np.stack([self._search(n)[0][nodes] for n in nodes])
+
+    def route_length(self, waypoints: list[tuple[int, int, int]]) -> int:
+        '''Length of the route visiting the waypoints in the given order; -1 if impossible'''
+        total = 0
+        for a, b in zip(waypoints, waypoints[1:]):
+            d = self.distance(a, b)
+            if d < 0:
+                return -1
+            total += d
+        return total
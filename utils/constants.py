@@ -6,3 +6,24 @@ SOMETHING_HINTS_SHOWN = 8
 
 NUM_OF_PITS = NUM_OF_MAZES - 1
 NUM_OF_INFO_HINTS = 2
+
+MAZE_SIZE = (10, 15) # in number of hallways
+MAZE_GENERATOR = 'prims' # one of maze_utils.GENERATORS
+FOG_RADIUS = 3 # of every fog blob, in tiles
+HPA_CLUSTER_SIZE = 16 # side of the clusters of the hierarchical pathfinder, in tiles
+SAVE_FORMAT_VERSION = 1 # of the files written by Game.save
+GENERATOR_VERSION = 1 # bump whenever the same room id starts generating a different game (MAZE_SIZE and MAZE_GENERATOR are part of the room cache key already)
+ROOM_CACHE_DIR = '.room_cache'
+ROOM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PARALLEL_BUILD_MIN_TILES = 250_000 # Game builds its mazes in worker processes from this many tiles on
+ROOM_POOL_SIZE = 4 # games kept ready for the RANDOM button
+ROOM_POOL_WORKERS = 1
+
+# spawn keys of the random streams of a room, see utils.utils.room_rng
+RNG_WORDS = 0
+RNG_CODES = 1
+RNG_MAZE = 2 # spawned further by maze index and generation stage
+RNG_MARKS = 3
+RNG_HINTS = 4
+RNG_START = 5
+RNG_EXIT = 6
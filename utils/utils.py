@@ -1,4 +1,8 @@
 from pathlib import Path
+import struct
+import zipfile
+
+import numpy as np
 
 
 def get_english_words() -> list[str]:
@@ -12,3 +16,30 @@ def split_word_into(word: str, n_parts: int) -> list[str]:
     if len(word) % n_parts == 0: return tmp
     tmp[-1] += word[-1]
     return tmp
+
+def room_rng(room_id: int, *spawn_key: int) -> np.random.Generator:
+    '''Independent random stream of a room: the child of SeedSequence(room_id)
+    spawned down along spawn_key (see RNG_* in utils.constants).
+    The same room id and key always give the same stream, and no global state is touched.'''
+    return np.random.default_rng(np.random.SeedSequence(room_id, spawn_key=spawn_key))
+
+def load_npz_memmap(path: str | Path, mmap_mode: str = 'r') -> dict[str, np.ndarray]:
+    '''The arrays of an uncompressed .npz (np.savez), memory-mapped in place.
+    np.load ignores mmap_mode for .npz files and reads every array; here every
+    member is mapped at its offset inside the zip instead, so nothing is copied.
+    mmap_mode: as in np.load ('r' read-only, 'c' copy-on-write, 'r+' write back)'''
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f'{path}: {info.filename} is compressed and cannot be memory-mapped')
+            # the local file header is 30 bytes, then the name and the extra field, then the data
+            f.seek(info.header_offset)
+            name_len, extra_len = struct.unpack('<HH', f.read(30)[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            major, _ = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if major == 1 else np.lib.format.read_array_header_2_0
+            shape, fortran_order, dtype = read_header(f)
+            arrays[info.filename.removesuffix('.npy')] = np.memmap(
+                path, dtype=dtype, mode=mmap_mode, offset=f.tell(), shape=shape, order='F' if fortran_order else 'C')
+    return arrays